@@ -1,26 +1,67 @@
+import asyncio
+import hashlib
 import os
-from datetime import datetime, timedelta
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from .utils.timezone import now_cat
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from . import schemas
+from . import config, schemas
 from .database import get_db
-from .models import User
+from .models import RefreshToken, User
+from .utils.cache import LRUCache
 
 SECRET_KEY = os.environ.get("JWT_SECRET", "super-secret-key")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 8
+ACCESS_TOKEN_EXPIRE_MINUTES = config.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_MINUTES = config.REFRESH_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = 60 * 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=config.BCRYPT_ROUNDS)
+# bcrypt releases the GIL, so a small dedicated pool hashes in parallel without
+# tying up the request thread pool; its size caps concurrent hashing.
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_executor_lock = threading.Lock()
+_last_refresh_purge = 0.0
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+@dataclass(frozen=True)
+class UserSnapshot:
+    """The authenticated user as seen by request handlers; detached from any session."""
+
+    id: int
+    username: str
+    full_name: str
+    role: str
+
+
+# Introspection cache: token -> (UserSnapshot, issued_at). A hit skips both the
+# signature check and the user lookup; entries never outlive the token itself.
+_token_cache = LRUCache(maxsize=config.AUTH_USER_CACHE_SIZE, ttl=config.AUTH_USER_CACHE_TTL_SECONDS)
+# user id -> time of revocation. Access tokens issued at or before it are
+# rejected, so revoking a user is one write however many tokens they hold.
+# Entries only need to outlive the access tokens they cover.
+_revoked_users = LRUCache(maxsize=config.AUTH_USER_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def _is_revoked(user_id: int, issued_at: int) -> bool:
+    revoked_at = _revoked_users.get(user_id)
+    return revoked_at is not None and issued_at <= revoked_at
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -32,14 +73,131 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = now_cat() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": int(time.time())})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _refresh_token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(db: Session, user_id: int, expires_at: Optional[datetime] = None) -> str:
+    """Stage a new refresh token for ``user_id`` in the caller's transaction and return its raw value."""
+    global _last_refresh_purge
+    now = time.monotonic()
+    if now - _last_refresh_purge > REFRESH_TOKEN_PURGE_INTERVAL_SECONDS:
+        _last_refresh_purge = now
+        db.query(RefreshToken).filter(RefreshToken.expires_at <= datetime.now(timezone.utc)).delete(
+            synchronize_session=False
+        )
+    token = secrets.token_urlsafe(32)
+    if expires_at is None:
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
+    db.add(RefreshToken(user_id=user_id, token_hash=_refresh_token_digest(token), expires_at=expires_at))
+    return token
+
+
+def issue_tokens(db: Session, user: User) -> schemas.Token:
+    """Access token plus a fresh refresh token for a login; commits the refresh token."""
+    refresh_token = issue_refresh_token(db, user.id)
+    db.commit()
+    return schemas.Token(
+        access_token=create_access_token({"sub": user.username}),
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token,
+    )
+
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[schemas.Token]:
+    """Exchange a live refresh token for a new token pair, or return ``None``.
+
+    The presented token is revoked and its replacement keeps the original
+    expiry, so refreshing never extends a session past its login. Revoking
+    with a conditional UPDATE means a token can only be spent once even when
+    two requests race with it.
+    """
+    now = datetime.now(timezone.utc)
+    record = (
+        db.query(RefreshToken.id, RefreshToken.user_id, RefreshToken.expires_at)
+        .filter(
+            RefreshToken.token_hash == _refresh_token_digest(token),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .first()
+    )
+    if record is None:
+        return None
+    user = db.query(User.id, User.username).filter(User.id == record.user_id).first()
+    if user is None:
+        return None
+    spent = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == record.id, RefreshToken.revoked_at.is_(None))
+        .update({"revoked_at": now}, synchronize_session=False)
+    )
+    if not spent:
+        db.rollback()
+        return None
+    refresh_token = issue_refresh_token(db, user.id, expires_at=record.expires_at)
+    db.commit()
+    expires_at = record.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    lifetime = min(timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES), expires_at - now)
+    return schemas.Token(
+        access_token=create_access_token({"sub": user.username}, expires_delta=lifetime),
+        expires_in=int(lifetime.total_seconds()),
+        refresh_token=refresh_token,
+    )
+
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.token_hash == _refresh_token_digest(token), RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": datetime.now(timezone.utc)}, synchronize_session=False)
+    db.commit()
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> None:
+    """Revoke every token ``user_id`` holds.
+
+    Refresh tokens are deleted in the caller's transaction; access tokens are
+    rejected from now on by this process without touching the token cache.
+    Other worker processes stop accepting them once their cached entry
+    expires (``AUTH_USER_CACHE_TTL_SECONDS``) and the user lookup fails.
+    """
+    _revoked_users.set(user_id, int(time.time()))
+    db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete(synchronize_session=False)
+
+
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is None:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _password_executor
+
+
+def shutdown_password_workers() -> None:
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is not None:
+            _password_executor.shutdown(wait=False, cancel_futures=True)
+            _password_executor = None
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), get_password_hash, password)
+
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     user = get_user_by_username(db, username)
     if not user or not verify_password(password, user.hashed_password):
@@ -47,15 +205,59 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     return user
 
 
+def _load_user_detached(db: Session, username: str) -> Optional[User]:
+    user = get_user_by_username(db, username)
+    if user:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def _store_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+    db.commit()
+
+
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[User]:
+    """Like ``authenticate_user`` but safe to await from an async route.
+
+    Database work runs in the request thread pool and hashing on the password
+    pool, so neither blocks the event loop. The user is detached and the read
+    transaction closed before hashing, so a burst of logins does not hold a
+    pooled connection each while waiting for bcrypt. Hashes made with an
+    outdated cost (see ``BCRYPT_ROUNDS``) are replaced in the same pass.
+    """
+    user = await run_in_threadpool(_load_user_detached, db, username)
+    if not user:
+        return None
+    loop = asyncio.get_running_loop()
+    valid, new_hash = await loop.run_in_executor(
+        _get_password_executor(), pwd_context.verify_and_update, password, user.hashed_password
+    )
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, db, user.id, new_hash)
+        user.hashed_password = new_hash
+    return user
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> UserSnapshot:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cached = _token_cache.get(token)
+    if cached is not None:
+        snapshot, issued_at = cached
+        if _is_revoked(snapshot.id, issued_at):
+            raise credentials_exception
+        return snapshot
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -64,11 +266,21 @@ def get_current_user(
         token_data = schemas.TokenData(username=username)
     except JWTError as exc:
         raise credentials_exception from exc
-    user = get_user_by_username(db, username=token_data.username)
-    if user is None:
+    row = (
+        db.query(User.id, User.username, User.full_name, User.role)
+        .filter(User.username == token_data.username)
+        .first()
+    )
+    issued_at = int(payload.get("iat", 0))
+    if row is None or _is_revoked(row.id, issued_at):
         raise credentials_exception
-    return user
+    snapshot = UserSnapshot(id=row.id, username=row.username, full_name=row.full_name, role=row.role)
+    ttl = config.AUTH_USER_CACHE_TTL_SECONDS
+    expires_in = payload.get("exp", 0) - time.time()
+    if ttl > 0 and expires_in > 0:
+        _token_cache.set(token, (snapshot, issued_at), ttl=min(ttl, expires_in))
+    return snapshot
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
-    return current_user
\ No newline at end of file
+def get_current_active_user(current_user: UserSnapshot = Depends(get_current_user)) -> UserSnapshot:
+    return current_user
@@ -0,0 +1,176 @@
+"""Helpers shared by the benchmark scripts in this package.
+
+Every benchmark runs against a throwaway SQLite file. The app reads
+``DATABASE_URL`` at import time, so ``temporary_database`` has to be entered
+before anything from ``backend`` is imported, and each database size needs
+its own process (see ``run_per_size``).
+"""
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Sequence
+
+SEED_BATCH_ROWS = 50_000
+SEED_PRODUCTS = 50
+SEED_DAYS = 365
+
+
+@contextmanager
+def temporary_database() -> Iterator[str]:
+    """Point the app at a fresh SQLite file for the duration of the block, then delete it."""
+    directory = tempfile.mkdtemp(prefix="ancestra-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench.db"
+    os.environ["MEDIA_ROOT"] = os.path.join(directory, "media")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    try:
+        yield directory
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_per_size(module: str, sizes: Sequence[int], extra_args: Sequence[str] = ()) -> None:
+    """Re-run ``module`` once per size, each in a fresh interpreter and database."""
+    for size in sizes:
+        subprocess.run([sys.executable, "-m", module, "--rows", str(size), *extra_args], check=True)
+
+
+def create_schema() -> None:
+    from backend import models  # noqa: F401  (registers the tables)
+    from backend.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_products(count: int = SEED_PRODUCTS, quantity: int = 1_000_000) -> None:
+    from sqlalchemy import text
+
+    from backend.database import engine
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO products (name, product_code, category, price, quantity, reorder_level) "
+                "VALUES (:name, :code, :category, :price, :quantity, 0)"
+            ),
+            [
+                {
+                    "name": f"Bench Product {index}",
+                    "code": f"BENCH-{index:04d}",
+                    "category": "Bench",
+                    "price": float(5 + index),
+                    "quantity": quantity,
+                }
+                for index in range(1, count + 1)
+            ],
+        )
+
+
+def seed_sales(rows: int, days: int = SEED_DAYS, seed: int = 7) -> None:
+    """Insert ``rows`` one-line sales spread over the last ``days`` days, plus daily expenses.
+
+    Timestamps are written as text in the format the database default uses,
+    so the seeded rows look like sales the app recorded itself.
+    """
+    from sqlalchemy import text
+
+    from backend.database import engine
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    sale_sql = text(
+        "INSERT INTO sales (id, customer_name, receipt_number, created_at, total_amount, payment_method, "
+        "created_by_id) VALUES (:id, NULL, :receipt, :created_at, :total, :method, 1)"
+    )
+    item_sql = text(
+        "INSERT INTO sale_items (sale_id, product_id, quantity, unit_price, subtotal) "
+        "VALUES (:sale_id, :product_id, :quantity, :unit_price, :subtotal)"
+    )
+    for start in range(0, rows, SEED_BATCH_ROWS):
+        sales, items = [], []
+        for sale_id in range(start + 1, min(start + SEED_BATCH_ROWS, rows) + 1):
+            product_id = rng.randint(1, SEED_PRODUCTS)
+            quantity = rng.randint(1, 5)
+            unit_price = float(5 + product_id)
+            created_at = now - timedelta(seconds=rng.randint(0, days * 24 * 60 * 60))
+            sales.append(
+                {
+                    "id": sale_id,
+                    "receipt": f"BENCH-{sale_id:08d}",
+                    "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    "total": unit_price * quantity,
+                    "method": rng.choice(("cash", "airtel_money", "mtn_money")),
+                }
+            )
+            items.append(
+                {
+                    "sale_id": sale_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "subtotal": unit_price * quantity,
+                }
+            )
+        with engine.begin() as connection:
+            connection.execute(sale_sql, sales)
+            connection.execute(item_sql, items)
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO expenses (description, category, amount, expense_date) "
+                "VALUES ('Bench expense', :category, :amount, :day)"
+            ),
+            [
+                {
+                    "category": rng.choice(("Utilities", "Inventory", "Rent")),
+                    "amount": float(rng.randint(10, 500)),
+                    "day": (now - timedelta(days=offset)).date().isoformat(),
+                }
+                for offset in range(days)
+                for _ in range(3)
+            ],
+        )
+
+
+@contextmanager
+def count_statements() -> Iterator[dict]:
+    from sqlalchemy import event
+
+    from backend.database import engine
+
+    counter = {"statements": 0}
+
+    def _count(*args, **kwargs):
+        counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def login(client, username: str = "owner", password: str = "owner123") -> dict:
+    response = client.post("/api/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
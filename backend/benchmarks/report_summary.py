@@ -0,0 +1,65 @@
+"""Benchmark ``GET /api/reports/summary`` against growing sales tables.
+
+Usage::
+
+    python -m backend.benchmarks.report_summary                  # 10k, 100k and 1M sales
+    python -m backend.benchmarks.report_summary --sizes 10000 --runs 100
+
+Each size is seeded into a fresh SQLite file and runs in its own process.
+The app's own startup then backfills any rollups. Prints the statements
+per request and the p50/p95 latency over ``--runs`` requests, after a few
+warm-up requests.
+"""
+import argparse
+
+from . import _common
+
+MODULE = "backend.benchmarks.report_summary"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+WARMUP_REQUESTS = 3
+
+
+def benchmark(rows: int, runs: int) -> None:
+    with _common.temporary_database():
+        _common.create_schema()
+        seed_time, _ = _common.timed(lambda: (_common.seed_products(), _common.seed_sales(rows)))
+
+        from fastapi.testclient import TestClient
+
+        from backend.main import app
+
+        with TestClient(app) as client:
+            headers = _common.login(client)
+            for _ in range(WARMUP_REQUESTS):
+                client.get("/api/reports/summary", headers=headers).raise_for_status()
+            latencies = []
+            statements = set()
+            for _ in range(runs):
+                with _common.count_statements() as counter:
+                    elapsed, response = _common.timed(lambda: client.get("/api/reports/summary", headers=headers))
+                response.raise_for_status()
+                latencies.append(elapsed * 1000)
+                statements.add(counter["statements"])
+
+    print(
+        f"{rows:>9,} sales | statements/request {'/'.join(map(str, sorted(statements)))} | "
+        f"p50 {_common.percentile(latencies, 50):7.1f} ms | p95 {_common.percentile(latencies, 95):7.1f} ms | "
+        f"seeded in {seed_time:.0f}s",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    if args.rows is not None:
+        benchmark(args.rows, args.runs)
+    else:
+        _common.run_per_size(MODULE, args.sizes, ["--runs", str(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
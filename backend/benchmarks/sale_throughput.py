@@ -0,0 +1,74 @@
+"""Benchmark ``POST /api/sales/`` throughput by basket size.
+
+Usage::
+
+    python -m backend.benchmarks.sale_throughput                   # 1, 5, 20 and 40 lines
+    python -m backend.benchmarks.sale_throughput --baskets 1 40 --sales 500
+
+Sales are posted one after another from a single client against a fresh
+SQLite file that already holds ``--rows`` sales. For each basket size the
+script prints the statements per sale, sales/s and p50/p95 latency.
+"""
+import argparse
+import random
+
+from . import _common
+
+DEFAULT_BASKETS = (1, 5, 20, 40)
+WARMUP_SALES = 5
+
+
+def benchmark(baskets: list[int], sales: int, rows: int) -> None:
+    if max(baskets) > _common.SEED_PRODUCTS:
+        raise SystemExit(f"Baskets can hold at most {_common.SEED_PRODUCTS} distinct products")
+    with _common.temporary_database():
+        _common.create_schema()
+        _common.seed_products()
+        _common.seed_sales(rows)
+
+        from fastapi.testclient import TestClient
+
+        from backend.main import app
+
+        rng = random.Random(11)
+        with TestClient(app) as client:
+            headers = _common.login(client)
+
+            def post_sale(lines: int):
+                product_ids = rng.sample(range(1, _common.SEED_PRODUCTS + 1), lines)
+                payload = {
+                    "payment_method": "cash",
+                    "items": [{"product_id": product_id, "quantity": 1} for product_id in product_ids],
+                }
+                return client.post("/api/sales/", json=payload, headers=headers)
+
+            for lines in baskets:
+                for _ in range(WARMUP_SALES):
+                    post_sale(lines).raise_for_status()
+                latencies = []
+                statements = []
+                for _ in range(sales):
+                    with _common.count_statements() as counter:
+                        elapsed, response = _common.timed(lambda: post_sale(lines))
+                    response.raise_for_status()
+                    latencies.append(elapsed * 1000)
+                    statements.append(counter["statements"])
+                print(
+                    f"{lines:>3} lines | statements/sale {min(statements)}-{max(statements)} | "
+                    f"{len(latencies) / (sum(latencies) / 1000):6.1f} sales/s | "
+                    f"p50 {_common.percentile(latencies, 50):6.1f} ms | p95 {_common.percentile(latencies, 95):6.1f} ms",
+                    flush=True,
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baskets", type=int, nargs="+", default=DEFAULT_BASKETS)
+    parser.add_argument("--sales", type=int, default=200, help="sales timed per basket size")
+    parser.add_argument("--rows", type=int, default=10_000, help="sales already in the database")
+    args = parser.parse_args()
+    benchmark(args.baskets, args.sales, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,3 +9,43 @@ MEDIA_RECEIPT_DIR = MEDIA_ROOT / "logos"
 MEDIA_RECEIPT_DIR.mkdir(parents=True, exist_ok=True)
 MEDIA_EXPENSE_RECEIPTS_DIR = MEDIA_ROOT / "expense_receipts"
 MEDIA_EXPENSE_RECEIPTS_DIR.mkdir(parents=True, exist_ok=True)
+MEDIA_QUOTATIONS_DIR = MEDIA_ROOT / "quotations"
+MEDIA_QUOTATIONS_DIR.mkdir(parents=True, exist_ok=True)
+MEDIA_REPORT_EXPORTS_DIR = MEDIA_ROOT / "exports"
+MEDIA_REPORT_EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+RECEIPT_CACHE_SIZE = int(os.environ.get("RECEIPT_CACHE_SIZE", "512"))
+# Optional second cache tier for rendered receipts, shared by all workers on the host.
+RECEIPT_DISK_CACHE = os.environ.get("RECEIPT_DISK_CACHE", "").lower() in {"1", "true", "yes"}
+MEDIA_RECEIPT_CACHE_DIR = MEDIA_ROOT / "cache" / "receipts"
+if RECEIPT_DISK_CACHE:
+    MEDIA_RECEIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Receipt logos are inlined at twice their 120px display height; 0 keeps the original size.
+RECEIPT_LOGO_MAX_HEIGHT = int(os.environ.get("RECEIPT_LOGO_MAX_HEIGHT", "240"))
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+# Receipt numbers each worker reserves per database round-trip; unused numbers are skipped on restart.
+RECEIPT_BLOCK_SIZE = max(1, int(os.environ.get("RECEIPT_BLOCK_SIZE", "50")))
+QUOTATION_BLOCK_SIZE = max(1, int(os.environ.get("QUOTATION_BLOCK_SIZE", "10")))
+# CPU-bound rendering (PDF, QR, receipts) runs in a process pool; 0 workers renders inline.
+RENDER_WORKERS = max(0, int(os.environ.get("RENDER_WORKERS", str(min(2, os.cpu_count() or 1)))))
+RENDER_QUEUE_SIZE = max(0, int(os.environ.get("RENDER_QUEUE_SIZE", "8")))
+RENDER_TIMEOUT_SECONDS = float(os.environ.get("RENDER_TIMEOUT_SECONDS", "30"))
+REPORT_EXPORT_WORKERS = max(1, int(os.environ.get("REPORT_EXPORT_WORKERS", "2")))
+# Identical export requests reuse a job that is still in progress, or one that finished within this window.
+REPORT_EXPORT_FRESHNESS_SECONDS = int(os.environ.get("REPORT_EXPORT_FRESHNESS_SECONDS", "300"))
+# Jobs left pending since they were queued, or running since a worker claimed them, for this long
+# (e.g. the worker restarted) are reported as failed.
+REPORT_EXPORT_STALE_SECONDS = int(os.environ.get("REPORT_EXPORT_STALE_SECONDS", "900"))
+# Generated product codes are PROD- plus a base36 counter padded to this many characters.
+PRODUCT_CODE_WIDTH = max(1, int(os.environ.get("PRODUCT_CODE_WIDTH", "4")))
+PRODUCT_CODE_BLOCK_SIZE = max(1, int(os.environ.get("PRODUCT_CODE_BLOCK_SIZE", "100")))
+# Authenticated users are resolved from a per-process snapshot cache for this long.
+AUTH_USER_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "1024"))
+# bcrypt cost for new hashes; stored hashes with another cost are re-hashed on the next login.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+# Password hashes are computed on a dedicated pool of this many threads.
+PASSWORD_HASH_WORKERS = max(1, int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))))
+# Access tokens are short-lived; clients renew them with a refresh token, which
+# keeps the expiry of the login it came from.
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_MINUTES = int(os.environ.get("REFRESH_TOKEN_EXPIRE_MINUTES", str(60 * 8)))
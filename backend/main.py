@@ -7,12 +7,15 @@ from .utils.timezone import now_cat
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
 
 from . import auth, config
 from .database import Base, SessionLocal, engine
-from .models import Expense, Product, ReceiptSettings, Sale, SaleItem, User
+from .models import DailyRollup, Expense, Product, ProductSalesTotal, ReceiptSettings, Sale, SaleItem, User
 from .routes import auth as auth_routes
 from .routes import employees, expenses, products, reports, sales, settings, quotations
+from .utils import render_pool
+from .utils.rollups import rebuild_daily_rollups, rebuild_product_rollups
 
 app = FastAPI(title="Ancestra Business API", version="0.1.0")
 
@@ -81,6 +84,19 @@ def ensure_sale_created_by_column() -> None:
         connection.execute(text("ALTER TABLE sales ADD COLUMN created_by_id INTEGER"))
 
 
+def ensure_sale_client_key_column() -> None:
+    inspector = inspect(engine)
+    if "sales" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("sales")}
+    if "client_key" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE sales ADD COLUMN client_key VARCHAR(64)"))
+
+
 def ensure_expense_receipt_column() -> None:
     inspector = inspect(engine)
     if "expenses" not in inspector.get_table_names():
@@ -94,6 +110,28 @@ def ensure_expense_receipt_column() -> None:
         connection.execute(text("ALTER TABLE expenses ADD COLUMN receipt_path VARCHAR(255)"))
 
 
+def ensure_report_export_started_at_column() -> None:
+    inspector = inspect(engine)
+    if "report_exports" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("report_exports")}
+    if "started_at" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE report_exports ADD COLUMN started_at TIMESTAMP WITH TIME ZONE"))
+
+
+def ensure_indexes() -> None:
+    """Create indexes declared on the models that existing databases are missing."""
+    # IF NOT EXISTS rather than checkfirst: SQLite does not reflect expression indexes.
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
 def seed_data() -> None:
     with session_scope() as db:
         owner = db.query(User).filter(User.username == "owner").first()
@@ -152,13 +190,33 @@ def seed_data() -> None:
             )
 
 
+def ensure_rollups() -> None:
+    """Backfill the reporting rollups the first time they are deployed against existing data."""
+    with session_scope() as db:
+        if db.query(DailyRollup).first() is None:
+            rebuild_daily_rollups(db)
+        if db.query(ProductSalesTotal).first() is None and db.query(SaleItem).first() is not None:
+            rebuild_product_rollups(db)
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
     ensure_sale_payment_method_column()
     ensure_sale_created_by_column()
+    ensure_sale_client_key_column()
     ensure_expense_receipt_column()
+    ensure_report_export_started_at_column()
+    ensure_indexes()
     seed_data()
+    ensure_rollups()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    reports.shutdown_export_workers()
+    render_pool.shutdown()
+    auth.shutdown_password_workers()
 
 
 @app.get("/api/health")
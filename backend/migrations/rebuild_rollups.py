@@ -0,0 +1,27 @@
+"""
+Rebuild the reporting rollups (daily_rollups, product_sales_totals and
+product_daily_sales) from the full sales and expense history.
+
+Run from the project root:
+    python -m backend.migrations.rebuild_rollups
+"""
+from ..database import Base, SessionLocal, engine
+from ..utils.rollups import rebuild_daily_rollups, rebuild_product_rollups
+
+
+def migrate():
+    """Recompute every rollup row in a single transaction"""
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        days = rebuild_daily_rollups(db)
+        products = rebuild_product_rollups(db)
+        db.commit()
+        print(f"✓ Rebuilt daily rollups for {days} day(s) and sales totals for {products} product(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
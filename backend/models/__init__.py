@@ -4,7 +4,12 @@ from .sale import Sale, SaleItem
 from .expense import Expense
 from .setting import ReceiptSettings
 from .activity_log import ActivityLog
-from .quotation import QuotationCounter
+from .quotation import Quotation, QuotationCounter, QuotationItem
+from .idempotency import IdempotencyRecord
+from .refresh_token import RefreshToken
+from .sequence import SequenceCounter
+from .report_export import ReportExport
+from .rollup import DailyRollup, ProductDailySales, ProductSalesTotal
 
 __all__ = [
     "User",
@@ -15,4 +20,13 @@ __all__ = [
     "ReceiptSettings",
     "ActivityLog",
     "QuotationCounter",
+    "Quotation",
+    "QuotationItem",
+    "IdempotencyRecord",
+    "RefreshToken",
+    "SequenceCounter",
+    "ReportExport",
+    "DailyRollup",
+    "ProductSalesTotal",
+    "ProductDailySales",
 ]
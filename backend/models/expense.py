@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Date, Float, Integer, String
+from sqlalchemy import Column, Date, Float, Index, Integer, String
 
 from ..database import Base
 
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_expense_date", "expense_date"),
+        Index("ix_expenses_category_expense_date", "category", "expense_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(200), nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class IdempotencyRecord(Base):
+    """Response stored for a client ``Idempotency-Key`` so retries can be replayed."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_scope_user_key", "scope", "user_id", "key", unique=True),
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(40), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String(100), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 from sqlalchemy.sql import func
 
 from ..database import Base
@@ -15,4 +15,9 @@ class Product(Base):
     quantity = Column(Integer, nullable=False, default=0)
     reorder_level = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# Case-insensitive lookups used by product create and CSV import.
+Index("ix_products_name_lower", func.lower(Product.name))
+Index("ix_products_product_code_lower", func.lower(Product.product_code))
@@ -1,10 +1,59 @@
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from ..database import Base
 
 
 class QuotationCounter(Base):
+    """Legacy quote counter; numbers now come from the ``quotation`` sequence it seeds."""
+
     __tablename__ = "quotation_counter"
 
     id = Column(Integer, primary_key=True, index=True)
     counter = Column(Integer, nullable=False, default=0)
+
+
+class Quotation(Base):
+    __tablename__ = "quotations"
+    __table_args__ = (Index("ix_quotations_created_at_id", "created_at", "id"),)
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    quote_number = Column(String(40), unique=True, index=True, nullable=False)
+    customer_name = Column(String(100), nullable=False)
+    customer_address = Column(String(255), nullable=True)
+    customer_city = Column(String(100), nullable=True)
+    quote_date = Column(Date, nullable=False)
+    due_date = Column(Date, nullable=False)
+    subtotal = Column(Float, nullable=False, default=0)
+    tax_rate = Column(Float, nullable=False, default=0)
+    tax_amount = Column(Float, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0)
+    terms = Column(Text, nullable=True)
+    # SHA-256 of the rendered PDF; the file is stored content-addressed (see utils/artifacts.py).
+    pdf_sha256 = Column(String(64), nullable=True)
+    pdf_size = Column(Integer, nullable=True)
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    items = relationship(
+        "QuotationItem",
+        back_populates="quotation",
+        cascade="all, delete-orphan",
+        order_by="QuotationItem.id",
+    )
+
+
+class QuotationItem(Base):
+    __tablename__ = "quotation_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    quotation_id = Column(Integer, ForeignKey("quotations.id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="SET NULL"), nullable=True)
+    description = Column(String(255), nullable=False)
+    quantity = Column(Float, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    amount = Column(Float, nullable=False)
+
+    quotation = relationship("Quotation", back_populates="items")
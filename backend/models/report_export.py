@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class ReportExport(Base):
+    """A queued or finished report export; the artifact is stored content-addressed."""
+
+    __tablename__ = "report_exports"
+    __table_args__ = (Index("ix_report_exports_params_hash_created_at", "params_hash", "created_at"),)
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(32), unique=True, index=True, nullable=False)
+    format = Column(String(10), nullable=False, default="pdf")
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+    # Hash of format and date range, used to reuse recent identical exports.
+    params_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+    artifact_sha256 = Column(String(64), nullable=True)
+    artifact_size = Column(Integer, nullable=True)
+    requested_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set when an export worker claims the job.
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer
+
+from ..database import Base
+
+
+class DailyRollup(Base):
+    """Per CAT calendar day sales and expense totals, maintained on write."""
+
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    sales_total = Column(Float, nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
+    expense_total = Column(Float, nullable=False, default=0)
+    cash_total = Column(Float, nullable=False, default=0)
+    bank_transfer_total = Column(Float, nullable=False, default=0)
+    airtel_money_total = Column(Float, nullable=False, default=0)
+    mtn_money_total = Column(Float, nullable=False, default=0)
+
+
+class ProductSalesTotal(Base):
+    """All-time units sold and revenue per product, for indexed top-N reads."""
+
+    __tablename__ = "product_sales_totals"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    total_quantity = Column(Integer, nullable=False, default=0, index=True)
+    total_revenue = Column(Float, nullable=False, default=0)
+
+
+class ProductDailySales(Base):
+    """Units sold and revenue per product per CAT calendar day."""
+
+    __tablename__ = "product_daily_sales"
+    __table_args__ = (Index("ix_product_daily_sales_day_product", "day", "product_id"),)
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
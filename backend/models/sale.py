@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,6 +7,12 @@ from ..database import Base
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_created_at_id", "created_at", "id"),
+        Index("ix_sales_created_by_id_created_at", "created_by_id", "created_at"),
+        Index("ix_sales_client_key", "client_key", unique=True),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String(100), nullable=True)
@@ -15,6 +21,8 @@ class Sale(Base):
     total_amount = Column(Float, nullable=False, default=0)
     payment_method = Column(String(20), nullable=False, default="cash")
     created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Idempotency key supplied by offline tills when replaying queued sales.
+    client_key = Column(String(64), nullable=True)
 
     items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
     created_by = relationship("User", back_populates="sales")
@@ -22,6 +30,10 @@ class Sale(Base):
 
 class SaleItem(Base):
     __tablename__ = "sale_items"
+    __table_args__ = (
+        Index("ix_sale_items_product_id_sale_id", "product_id", "sale_id"),
+        Index("ix_sale_items_sale_id", "sale_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sale_id = Column(Integer, ForeignKey("sales.id", ondelete="CASCADE"))
@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, String
+
+from ..database import Base
+
+
+class SequenceCounter(Base):
+    """Last value handed out for a named sequence; workers reserve blocks from it."""
+
+    __tablename__ = "sequence_counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -8,34 +9,57 @@ from ..database import get_db
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
+def _username_taken(db: Session, username: str) -> bool:
+    taken = auth.get_user_by_username(db, username) is not None
+    # Release the connection before the (slow) hash below.
+    db.rollback()
+    return taken
+
+
+def _save_user(db: Session, user: models.User) -> models.User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.post("/register", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(models.User).filter(models.User.username == user_in.username).first()
-    if existing:
+async def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_username_taken, db, user_in.username):
         raise HTTPException(status_code=400, detail="Username already registered")
-    hashed_password = auth.get_password_hash(user_in.password)
+    hashed_password = await auth.get_password_hash_async(user_in.password)
     user = models.User(
         username=user_in.username,
         full_name=user_in.full_name,
         role=user_in.role,
         hashed_password=hashed_password,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_save_user, db, user)
 
 
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = auth.authenticate_user(db, form_data.username, form_data.password)
+    user = await auth.authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect credentials")
-    access_token = auth.create_access_token({"sub": user.username})
-    return schemas.Token(access_token=access_token)
+    return await run_in_threadpool(auth.issue_tokens, db, user)
+
+
+@router.post("/refresh", response_model=schemas.Token)
+def refresh_access_token(payload: schemas.RefreshTokenRequest, db: Session = Depends(get_db)):
+    tokens = auth.rotate_refresh_token(db, payload.refresh_token)
+    if tokens is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+    return tokens
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(payload: schemas.RefreshTokenRequest, db: Session = Depends(get_db)) -> Response:
+    auth.revoke_refresh_token(db, payload.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/me", response_model=schemas.UserRead)
@@ -1,9 +1,9 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from ..utils.timezone import now_cat
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from .. import auth, models, schemas
@@ -36,15 +36,56 @@ def ensure_management(user: models.User) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
 
-def _sales_stats(db: Session, user_id: int, created_after: Optional[datetime] = None) -> tuple[int, float]:
-    query = db.query(
-        func.count(models.Sale.id),
-        func.coalesce(func.sum(models.Sale.total_amount), 0.0),
-    ).filter(models.Sale.created_by_id == user_id)
-    if created_after:
-        query = query.filter(models.Sale.created_at >= created_after)
-    count, amount = query.one()
-    return int(count or 0), float(amount or 0.0)
+RECENT_ACTIVITY_LIMIT = 5
+
+
+def _sales_stats_by_user(db: Session, periods: dict[str, datetime]) -> dict[int, dict[str, tuple[int, float]]]:
+    """Sale count and amount per creator, overall and since each of ``periods``, in one query.
+
+    Every period is a conditional aggregate over the same pass, so the cost no
+    longer grows with the number of employees times the number of periods.
+    """
+    Sale = models.Sale
+    columns = [func.count(Sale.id), func.coalesce(func.sum(Sale.total_amount), 0.0)]
+    for start in periods.values():
+        in_period = Sale.created_at >= start
+        columns.append(func.coalesce(func.sum(case((in_period, 1), else_=0)), 0))
+        columns.append(func.coalesce(func.sum(case((in_period, Sale.total_amount), else_=0.0)), 0.0))
+
+    stats: dict[int, dict[str, tuple[int, float]]] = {}
+    rows = db.query(Sale.created_by_id, *columns).filter(Sale.created_by_id.isnot(None)).group_by(Sale.created_by_id)
+    for user_id, *values in rows:
+        totals = {"total": (int(values[0] or 0), float(values[1] or 0.0))}
+        for index, name in enumerate(periods, start=1):
+            totals[name] = (int(values[2 * index] or 0), float(values[2 * index + 1] or 0.0))
+        stats[user_id] = totals
+    return stats
+
+
+def _recent_activity_by_user(db: Session, limit: int = RECENT_ACTIVITY_LIMIT) -> dict[int, list[schemas.EmployeeActivity]]:
+    """The latest ``limit`` activity entries of every user, from one windowed query."""
+    ActivityLog = models.ActivityLog
+    position = (
+        func.row_number()
+        .over(partition_by=ActivityLog.user_id, order_by=(ActivityLog.created_at.desc(), ActivityLog.id.desc()))
+        .label("position")
+    )
+    ranked = (
+        db.query(ActivityLog.user_id, ActivityLog.action, ActivityLog.description, ActivityLog.created_at, position)
+        .filter(ActivityLog.user_id.isnot(None))
+        .subquery()
+    )
+    rows = (
+        db.query(ranked.c.user_id, ranked.c.action, ranked.c.description, ranked.c.created_at)
+        .filter(ranked.c.position <= limit)
+        .order_by(ranked.c.user_id, ranked.c.position)
+    )
+    activity: dict[int, list[schemas.EmployeeActivity]] = defaultdict(list)
+    for user_id, action, description, created_at in rows:
+        activity[user_id].append(
+            schemas.EmployeeActivity(action=action, description=description, created_at=created_at)
+        )
+    return activity
 
 
 @router.get("/", response_model=list[schemas.EmployeeSummary])
@@ -55,28 +96,23 @@ def list_employees(
     ensure_management(current_user)
 
     now = now_cat()
-    week_start = now - timedelta(days=7)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    three_months_start = now - timedelta(days=90)
+    periods = {
+        "week": now - timedelta(days=7),
+        "month": now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+        "three_months": now - timedelta(days=90),
+    }
 
     users = db.query(models.User).order_by(models.User.full_name).all()
+    sales_stats = _sales_stats_by_user(db, periods)
+    recent_activity = _recent_activity_by_user(db)
     summaries: list[schemas.EmployeeSummary] = []
 
     for user in users:
-        total_count, total_amount = _sales_stats(db, user.id)
-        week_count, week_amount = _sales_stats(db, user.id, week_start)
-        month_count, month_amount = _sales_stats(db, user.id, month_start)
-
-        activities = (
-            db.query(models.ActivityLog)
-            .filter(models.ActivityLog.user_id == user.id)
-            .order_by(models.ActivityLog.created_at.desc())
-            .limit(5)
-            .all()
-        )
-
-        three_count, three_amount = _sales_stats(db, user.id, three_months_start)
-
+        stats = sales_stats.get(user.id, {})
+        total_count, total_amount = stats.get("total", (0, 0.0))
+        week_count, week_amount = stats.get("week", (0, 0.0))
+        month_count, month_amount = stats.get("month", (0, 0.0))
+        three_count, three_amount = stats.get("three_months", (0, 0.0))
         summaries.append(
             schemas.EmployeeSummary(
                 id=user.id,
@@ -91,14 +127,7 @@ def list_employees(
                     month=schemas.EmployeeSalesPeriod(count=month_count, amount=month_amount),
                     three_months=schemas.EmployeeSalesPeriod(count=three_count, amount=three_amount),
                 ),
-                recent_activity=[
-                    schemas.EmployeeActivity(
-                        action=activity.action,
-                        description=activity.description,
-                        created_at=activity.created_at,
-                    )
-                    for activity in activities
-                ],
+                recent_activity=recent_activity.get(user.id, []),
             )
         )
 
@@ -146,6 +175,7 @@ def delete_employee(
     )
     
     # Now safe to delete the user account
+    auth.revoke_user_tokens(db, employee_id)
     db.delete(employee)
     db.commit()
     
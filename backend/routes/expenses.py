@@ -2,12 +2,16 @@ from datetime import date
 from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import auth, config, models, schemas
 from ..database import get_db
+from ..utils import idempotency
 from ..utils.activity import log_activity
+from ..utils.csv_stream import csv_streaming_response, keyset_rows
+from ..utils.rollups import record_expense
 
 router = APIRouter(prefix="/api/expenses", tags=["expenses"])
 
@@ -68,10 +72,16 @@ async def create_expense(
     amount: float = Form(...),
     expense_date: date = Form(...),
     receipt: UploadFile | None = File(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     ensure_expense_role(current_user)
+    idempotency_key = idempotency.validate_key(idempotency_key)
+    if idempotency_key:
+        replay = idempotency.find_response(db, "expenses.create", current_user.id, idempotency_key)
+        if replay is not None:
+            return replay
     if amount < 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must be positive")
 
@@ -87,10 +97,26 @@ async def create_expense(
         receipt_path=receipt_path,
     )
     db.add(expense)
+    record_expense(db, expense_date, amount)
     log_activity(db, current_user.id, "expense_created", f"Recorded expense {category} for ZMW {amount:.2f}")
-    db.commit()
-    db.refresh(expense)
-    return _to_expense_read(expense)
+    db.flush()
+    expense_read = _to_expense_read(expense)
+    if idempotency_key:
+        idempotency.store_response(
+            db, "expenses.create", current_user.id, idempotency_key, status.HTTP_201_CREATED, expense_read.json()
+        )
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race; replay its response.
+        db.rollback()
+        replay = idempotency_key and idempotency.find_response(
+            db, "expenses.create", current_user.id, idempotency_key
+        )
+        if not replay:
+            raise
+        return replay
+    return expense_read
 
 
 @router.get("/", response_model=list[schemas.ExpenseRead])
@@ -112,6 +138,47 @@ def list_expenses(
     return [_to_expense_read(expense) for expense in expenses]
 
 
+EXPENSE_EXPORT_HEADER = ["id", "expense_date", "category", "description", "amount", "receipt_url"]
+
+
+@router.get("/export")
+def export_expenses(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    category: Optional[str] = Query(None),
+    gzip: bool = Query(False),
+    _: models.User = Depends(auth.get_current_active_user),
+):
+    """Stream matching expenses as CSV, oldest first."""
+
+    def rows(db: Session):
+        query = db.query(
+            models.Expense.id,
+            models.Expense.expense_date,
+            models.Expense.category,
+            models.Expense.description,
+            models.Expense.amount,
+            models.Expense.receipt_path,
+        )
+        if start_date:
+            query = query.filter(models.Expense.expense_date >= start_date)
+        if end_date:
+            query = query.filter(models.Expense.expense_date <= end_date)
+        if category:
+            query = query.filter(models.Expense.category == category)
+        for expense in keyset_rows(db, query, (models.Expense.expense_date, models.Expense.id)):
+            yield [
+                expense.id,
+                expense.expense_date.isoformat(),
+                expense.category,
+                expense.description,
+                f"{expense.amount:.2f}",
+                _build_receipt_url(expense.receipt_path) or "",
+            ]
+
+    return csv_streaming_response("expenses.csv", EXPENSE_EXPORT_HEADER, rows, gzip)
+
+
 @router.put("/{expense_id}", response_model=schemas.ExpenseRead)
 def update_expense(
     expense_id: int,
@@ -127,8 +194,12 @@ def update_expense(
     updates.pop("receipt_url", None)
     if "amount" in updates and updates["amount"] is not None and updates["amount"] < 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must be positive")
+    previous_date, previous_amount = expense.expense_date, expense.amount
     for field, value in updates.items():
         setattr(expense, field, value)
+    if (expense.expense_date, expense.amount) != (previous_date, previous_amount):
+        record_expense(db, previous_date, -previous_amount)
+        record_expense(db, expense.expense_date, expense.amount)
     log_activity(db, current_user.id, "expense_updated", f"Updated expense #{expense.id} ({expense.category})")
     db.commit()
     db.refresh(expense)
@@ -147,6 +218,7 @@ def delete_expense(
         raise HTTPException(status_code=404, detail="Expense not found")
     description = expense.description
     db.delete(expense)
+    record_expense(db, expense.expense_date, -expense.amount)
     log_activity(db, current_user.id, "expense_deleted", f"Deleted expense #{expense_id} ({description})")
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
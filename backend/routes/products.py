@@ -1,16 +1,20 @@
 import csv
 import io
-import random
 import string
-from typing import Dict, Optional
+from datetime import date, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from .. import auth, models, schemas
+from .. import auth, config, models, schemas
 from ..database import get_db
 from ..utils.activity import log_activity
+from ..utils.csv_stream import csv_streaming_response, keyset_rows
+from ..utils.product_import import ProductImporter
+from ..utils.sequences import BlockAllocator, caller_connection_if_locked
+from ..utils.timezone import cat_day_start_utc
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
@@ -23,17 +27,49 @@ def ensure_role(user: models.User, allowed_roles: set[str]) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
 
+BASE36_DIGITS = string.digits + string.ascii_uppercase
+
+_product_code_sequence = BlockAllocator(config.PRODUCT_CODE_BLOCK_SIZE)
+
+
+def format_product_code(value: int, width: int) -> str:
+    digits = ""
+    while value:
+        value, remainder = divmod(value, 36)
+        digits = BASE36_DIGITS[remainder] + digits
+    return "PROD-" + digits.rjust(width, "0")
+
+
+def generate_product_codes(db: Session, count: int, taken: Optional[set[str]] = None) -> list[str]:
+    """Hand out ``count`` unused PROD-XXXX codes from a shared base36 sequence.
+
+    The sequence never repeats a value, so the only codes that can already
+    exist are legacy random ones or codes typed in by hand. Each batch of
+    candidates is checked against those with a single IN query instead of a
+    SELECT per attempt. ``taken`` holds lower-cased codes that are reserved
+    but not yet stored.
+    """
+    reserved = {code.lower() for code in taken or ()}
+    connection = caller_connection_if_locked(db)
+    codes: list[str] = []
+    while len(codes) < count:
+        candidates = [
+            format_product_code(value, config.PRODUCT_CODE_WIDTH)
+            for value in _product_code_sequence.take("product_code", count - len(codes), connection)
+        ]
+        existing = {
+            code.lower()
+            for (code,) in db.query(models.Product.product_code).filter(
+                func.lower(models.Product.product_code).in_([code.lower() for code in candidates])
+            )
+        }
+        codes.extend(code for code in candidates if code.lower() not in existing | reserved)
+    return codes
+
+
 def generate_product_code(db: Session) -> str:
     """Generate a unique product code in the format PROD-XXXX where X is alphanumeric."""
-    max_attempts = 100
-    for _ in range(max_attempts):
-        code = "PROD-" + ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-        existing = db.query(models.Product).filter(models.Product.product_code == code).first()
-        if not existing:
-            return code
-    # Fallback to timestamp-based if random fails
-    import time
-    return f"PROD-{int(time.time() * 1000) % 100000000}"
+    return generate_product_codes(db, 1)[0]
 
 
 @router.get("/", response_model=list[schemas.ProductRead])
@@ -109,18 +145,34 @@ def delete_product(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/export", response_class=Response)
+PRODUCT_EXPORT_HEADER = ["id", "name", "product_code", "category", "price", "quantity", "reorder_level"]
+
+
+@router.get("/export")
 def export_products(
-    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    gzip: bool = Query(False),
     _: models.User = Depends(auth.get_current_active_user),
 ):
-    products = db.query(models.Product).order_by(models.Product.name).all()
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id", "name", "product_code", "category", "price", "quantity", "reorder_level"])
-    for product in products:
-        writer.writerow(
-            [
+    """Stream the catalogue as CSV; the date range filters on when products were added (CAT days)."""
+
+    def rows(db: Session):
+        query = db.query(
+            models.Product.id,
+            models.Product.name,
+            models.Product.product_code,
+            models.Product.category,
+            models.Product.price,
+            models.Product.quantity,
+            models.Product.reorder_level,
+        )
+        if start_date:
+            query = query.filter(models.Product.created_at >= cat_day_start_utc(start_date))
+        if end_date:
+            query = query.filter(models.Product.created_at < cat_day_start_utc(end_date + timedelta(days=1)))
+        for product in keyset_rows(db, query, (models.Product.name, models.Product.id)):
+            yield [
                 product.id,
                 product.name,
                 product.product_code or "",
@@ -129,16 +181,12 @@ def export_products(
                 product.quantity,
                 product.reorder_level,
             ]
-        )
-    return Response(
-        content=output.getvalue(),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=products.csv"},
-    )
+
+    return csv_streaming_response("products.csv", PRODUCT_EXPORT_HEADER, rows, gzip)
 
 
 @router.post("/import", status_code=status.HTTP_200_OK)
-async def import_products(
+def import_products(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user),
@@ -147,151 +195,30 @@ async def import_products(
     if not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload must be a CSV file")
 
+    # Read the spooled upload as a text stream instead of loading it into memory.
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
     try:
-        content_bytes = await file.read()
-        text = content_bytes.decode("utf-8-sig")
+        reader = csv.DictReader(text)
+        if not reader.fieldnames:
+            if any(line.strip() for line in text):
+                raise HTTPException(status_code=400, detail="CSV file is missing a header row.")
+            return {"created": 0, "updated": 0, "skipped": 0, "errors": []}
+        result = ProductImporter(db, generate_product_codes).run(reader)
     except UnicodeDecodeError as exc:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Unable to decode CSV file; use UTF-8 encoding.") from exc
+    finally:
+        text.detach()
 
-    if not text.strip():
-        return {"created": 0, "updated": 0, "skipped": 0, "errors": []}
-
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames:
-        raise HTTPException(status_code=400, detail="CSV file is missing a header row.")
-
-    created = 0
-    updated = 0
-    skipped = 0
-    errors: list[str] = []
-
-    def parse_int(value: Optional[str], field: str, row_number: int) -> Optional[int]:
-        if value is None or value == "":
-            return None
-        try:
-            return int(float(value))
-        except ValueError:
-            errors.append(f"Row {row_number}: Invalid integer for {field!r} -> {value!r}")
-            return None
-
-    def parse_float(value: Optional[str], field: str, row_number: int) -> Optional[float]:
-        if value is None or value == "":
-            return None
-        try:
-            return float(value)
-        except ValueError:
-            errors.append(f"Row {row_number}: Invalid number for {field!r} -> {value!r}")
-            return None
-
-    for row_number, row in enumerate(reader, start=2):
-        normalized: Dict[str, str] = {
-            (key or "").strip().lower(): (value or "").strip() for key, value in row.items()
-        }
-
-        product: Optional[models.Product] = None
-
-        product_id = parse_int(normalized.get("id") or normalized.get("product_id"), "id", row_number)
-        name = normalized.get("name") or normalized.get("product_name")
-        product_code = normalized.get("product_code") or normalized.get("code")
-        category = normalized.get("category")
-        price = parse_float(normalized.get("price"), "price", row_number)
-        quantity = parse_int(normalized.get("quantity"), "quantity", row_number)
-        reorder_level = parse_int(normalized.get("reorder_level"), "reorder_level", row_number)
-
-        if product_id:
-            product = db.get(models.Product, product_id)
-            if not product:
-                errors.append(f"Row {row_number}: Product with id={product_id} not found; skipping.")
-                skipped += 1
-                continue
-        elif product_code:
-            product = (
-                db.query(models.Product)
-                .filter(func.lower(models.Product.product_code) == product_code.lower())
-                .first()
-            )
-        elif name:
-            product = (
-                db.query(models.Product)
-                .filter(func.lower(models.Product.name) == name.lower())
-                .first()
-            )
-
-        if product:
-            if name:
-                product.name = name
-            if product_code:
-                product.product_code = product_code
-            if category:
-                product.category = category
-            if price is not None:
-                if price < 0:
-                    errors.append(f"Row {row_number}: price must be positive.")
-                else:
-                    product.price = price
-            if quantity is not None:
-                if quantity < 0:
-                    errors.append(f"Row {row_number}: quantity must be positive.")
-                else:
-                    product.quantity = quantity
-            if reorder_level is not None:
-                if reorder_level < 0:
-                    errors.append(f"Row {row_number}: reorder_level must be positive.")
-                else:
-                    product.reorder_level = reorder_level
-            updated += 1
-            continue
-
-        # Creating a new product requires mandatory fields
-        if not name:
-            errors.append(f"Row {row_number}: name is required to create a new product.")
-            skipped += 1
-            continue
-        if category is None or category == "":
-            errors.append(f"Row {row_number}: category is required to create a new product.")
-            skipped += 1
-            continue
-        if price is None:
-            errors.append(f"Row {row_number}: price is required to create a new product.")
-            skipped += 1
-            continue
-        if price < 0:
-            errors.append(f"Row {row_number}: price must be positive.")
-            skipped += 1
-            continue
-        if quantity is None:
-            errors.append(f"Row {row_number}: quantity is required to create a new product.")
-            skipped += 1
-            continue
-        if quantity < 0:
-            errors.append(f"Row {row_number}: quantity must be positive.")
-            skipped += 1
-            continue
-
-        # Auto-generate product code if not provided
-        if not product_code:
-            product_code = generate_product_code(db)
-
-        product = models.Product(
-            name=name,
-            product_code=product_code,
-            category=category,
-            price=price,
-            quantity=quantity,
-            reorder_level=reorder_level or 0,
-        )
-        db.add(product)
-        created += 1
-
-    if created or updated:
+    if result["created"] or result["updated"]:
         log_activity(
             db,
             current_user.id,
             "product_import",
-            f"Imported products: {created} created, {updated} updated, {skipped} skipped",
+            f"Imported products: {result['created']} created, {result['updated']} updated, {result['skipped']} skipped",
         )
         db.commit()
     else:
         db.rollback()
 
-    return {"created": created, "updated": updated, "skipped": skipped, "errors": errors}
+    return result
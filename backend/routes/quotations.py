@@ -1,79 +1,42 @@
 from datetime import date
 from io import BytesIO
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Response, HTTPException, status
+from fastapi import APIRouter, Depends, Header, Response, HTTPException, Query, status
 from fpdf import FPDF
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, selectinload
 
-from .. import auth, models, schemas
+from .. import auth, config, models, schemas
 from ..database import get_db
+from ..utils import render_pool
+from ..utils.artifacts import artifact_path, store_artifact
+from ..utils.http import file_response
+from ..utils.sequences import BlockAllocator
 from ..utils.timezone import now_cat
 
 router = APIRouter(prefix="/api/quotations", tags=["quotations"])
 
 
-def generate_quote_number(db: Session) -> str:
+def _seed_quote_sequence(conn: Connection, name: str) -> int:
+    """Continue numbering from the legacy ``quotation_counter`` row, if there is one."""
+    return conn.execute(select(func.max(models.QuotationCounter.counter))).scalar() or 0
+
+
+_quote_sequence = BlockAllocator(config.QUOTATION_BLOCK_SIZE, seed=_seed_quote_sequence)
+
+
+def generate_quote_number() -> str:
     """Generate a unique quote number in format QT0012_date_year"""
-    # Get or create counter record
-    counter_record = db.query(models.QuotationCounter).first()
-    if not counter_record:
-        counter_record = models.QuotationCounter(counter=0)
-        db.add(counter_record)
-        db.commit()
-    
-    # Increment counter
-    counter_record.counter += 1
-    db.add(counter_record)
-    db.commit()
-    
+    counter = _quote_sequence.next("quotation")
     now = now_cat()
     # Format: QT{counter:04d}_{day:02d}{month:02d}_{year}
-    return f"QT{counter_record.counter:04d}_{now.strftime('%d%m')}_{now.strftime('%Y')}"
+    return f"QT{counter:04d}_{now.strftime('%d%m')}_{now.strftime('%Y')}"
 
 
-@router.post("/generate-pdf", response_class=Response)
-def generate_quotation_pdf(
-    quotation: schemas.QuotationCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_active_user),
-):
-    """
-    Generate a quotation PDF based on the provided data.
-    """
-    # Validate products exist and get their details
-    quote_items = []
-    subtotal = 0.0
-    
-    for item in quotation.items:
-        product = db.query(models.Product).filter(models.Product.id == item.product_id).first()
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {item.product_id} not found"
-            )
-        
-        amount = item.quantity * item.unit_price
-        subtotal += amount
-        
-        quote_items.append({
-            "description": product.name,
-            "quantity": item.quantity,
-            "unit_price": item.unit_price,
-            "amount": amount,
-        })
-    
-    # Calculate tax and total
-    tax_amount = subtotal * (quotation.tax_rate / 100)
-    total = subtotal + tax_amount
-    
-    # Get company settings
-    settings = db.query(models.ReceiptSettings).first()
-    company_name = str(settings.company_name) if settings and settings.company_name else "Your Company Inc."
-    company_address = str(settings.company_address) if settings and settings.company_address else "Plot 6318 Elm Road Woodlands, Lusaka Zambia"
-    
-    # Generate quote number
-    quote_number = generate_quote_number(db)
-    
+def render_quotation_pdf(quotation: schemas.QuotationRead, company_name: str, company_address: str) -> bytes:
+    """Render a stored quotation to PDF bytes; runs in the rendering pool."""
     # Create PDF with FPDF
     pdf = FPDF()
     pdf.add_page()
@@ -113,7 +76,7 @@ def generate_quotation_pdf(
     pdf.set_font("Arial", "B", 10)
     pdf.cell(40, 6, "Quote #", align="L")
     pdf.set_font("Arial", "", 10)
-    pdf.cell(0, 6, quote_number, align="R", ln=True)
+    pdf.cell(0, 6, quotation.quote_number, align="R", ln=True)
     
     pdf.set_x(110)
     pdf.set_font("Arial", "B", 10)
@@ -139,11 +102,11 @@ def generate_quotation_pdf(
     
     # Items table rows
     pdf.set_font("Arial", "", 10)
-    for item in quote_items:
-        pdf.cell(20, 8, f"{item['quantity']:.2f}", border=1)
-        pdf.cell(95, 8, item['description'][:40], border=1)
-        pdf.cell(35, 8, f"ZMW {item['unit_price']:.2f}", border=1, align="R")
-        pdf.cell(40, 8, f"ZMW {item['amount']:.2f}", border=1, align="R", ln=True)
+    for item in quotation.items:
+        pdf.cell(20, 8, f"{item.quantity:.2f}", border=1)
+        pdf.cell(95, 8, item.description[:40], border=1)
+        pdf.cell(35, 8, f"ZMW {item.unit_price:.2f}", border=1, align="R")
+        pdf.cell(40, 8, f"ZMW {item.amount:.2f}", border=1, align="R", ln=True)
     
     pdf.ln(5)
     
@@ -151,16 +114,16 @@ def generate_quotation_pdf(
     pdf.set_font("Arial", "B", 10)
     pdf.cell(150, 6, "Subtotal", align="R")
     pdf.set_font("Arial", "", 10)
-    pdf.cell(40, 6, f"ZMW {subtotal:.2f}", align="R", ln=True)
+    pdf.cell(40, 6, f"ZMW {quotation.subtotal:.2f}", align="R", ln=True)
     
     pdf.set_font("Arial", "B", 10)
     pdf.cell(150, 6, f"Sales Tax ({quotation.tax_rate}%)", align="R")
     pdf.set_font("Arial", "", 10)
-    pdf.cell(40, 6, f"ZMW {tax_amount:.2f}", align="R", ln=True)
+    pdf.cell(40, 6, f"ZMW {quotation.tax_amount:.2f}", align="R", ln=True)
     
     pdf.set_font("Arial", "B", 11)
     pdf.cell(150, 8, "Total (ZMW)", align="R")
-    pdf.cell(40, 8, f"ZMW {total:.2f}", align="R", ln=True)
+    pdf.cell(40, 8, f"ZMW {quotation.total:.2f}", align="R", ln=True)
     
     pdf.ln(10)
     
@@ -182,17 +145,161 @@ def generate_quotation_pdf(
     pdf.set_font("Arial", "", 9)
     pdf.cell(80, 5, "customer signature", align="R", ln=True)
     
-    # Get PDF content
-    pdf_content = bytes(pdf.output())
+    return bytes(pdf.output())
+
+
+def company_details(db: Session) -> tuple[str, str]:
+    settings = db.query(models.ReceiptSettings).first()
+    company_name = str(settings.company_name) if settings and settings.company_name else "Your Company Inc."
+    company_address = str(settings.company_address) if settings and settings.company_address else "Plot 6318 Elm Road Woodlands, Lusaka Zambia"
+    return company_name, company_address
+
+
+def store_quotation_pdf(db: Session, quotation: models.Quotation) -> bytes:
+    """Render ``quotation`` and record the content address of its PDF."""
+    pdf_content = render_pool.render(
+        render_quotation_pdf, schemas.QuotationRead.from_orm(quotation), *company_details(db)
+    )
+    quotation.pdf_sha256 = store_artifact(config.MEDIA_QUOTATIONS_DIR, pdf_content, ".pdf")
+    quotation.pdf_size = len(pdf_content)
+    return pdf_content
+
+
+def pdf_headers(quotation: models.Quotation) -> dict[str, str]:
+    return {
+        "Content-Disposition": f'attachment; filename="{quotation.quote_number}.pdf"',
+        "Access-Control-Expose-Headers": "Content-Disposition, ETag",
+    }
+
+
+def get_quotation_or_404(db: Session, quote_number: str) -> models.Quotation:
+    quotation = (
+        db.query(models.Quotation)
+        .options(selectinload(models.Quotation.items))
+        .filter(models.Quotation.quote_number == quote_number)
+        .first()
+    )
+    if not quotation:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quotation not found")
+    return quotation
+
+
+@router.post("/generate-pdf", response_class=Response)
+def generate_quotation_pdf(
+    quotation: schemas.QuotationCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """
+    Generate a quotation PDF based on the provided data and store it for re-download.
+    """
+    # Validate products exist and get their details
+    product_ids = {item.product_id for item in quotation.items}
+    products = {
+        product.id: product
+        for product in db.query(models.Product).filter(models.Product.id.in_(product_ids))
+    }
+    quote_items = []
+    subtotal = 0.0
+    
+    for item in quotation.items:
+        product = products.get(item.product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with ID {item.product_id} not found"
+            )
+        
+        amount = item.quantity * item.unit_price
+        subtotal += amount
+        
+        quote_items.append(
+            models.QuotationItem(
+                product_id=product.id,
+                description=product.name,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                amount=amount,
+            )
+        )
     
-    # Return PDF as response using the quote number format
-    filename = f"{quote_number}.pdf"
+    # Calculate tax and total
+    tax_amount = subtotal * (quotation.tax_rate / 100)
+    total = subtotal + tax_amount
     
-    return Response(
-        content=pdf_content,
+    record = models.Quotation(
+        quote_number=generate_quote_number(),
+        customer_name=quotation.customer_name,
+        customer_address=quotation.customer_address,
+        customer_city=quotation.customer_city,
+        quote_date=quotation.quote_date,
+        due_date=quotation.due_date,
+        subtotal=subtotal,
+        tax_rate=quotation.tax_rate,
+        tax_amount=tax_amount,
+        total=total,
+        terms=quotation.terms,
+        created_by_id=current_user.id,
+        items=quote_items,
+    )
+    db.add(record)
+    db.flush()
+    pdf_content = store_quotation_pdf(db, record)
+    headers = pdf_headers(record)
+    headers["ETag"] = f'"{record.pdf_sha256}"'
+    db.commit()
+
+    return Response(content=pdf_content, media_type="application/pdf", headers=headers)
+
+
+@router.get("/", response_model=List[schemas.QuotationRead])
+def list_quotations(
+    customer: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    query = db.query(models.Quotation).options(selectinload(models.Quotation.items))
+    if customer:
+        query = query.filter(models.Quotation.customer_name.ilike(f"%{customer}%"))
+    return (
+        query.order_by(models.Quotation.created_at.desc(), models.Quotation.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/{quote_number}", response_model=schemas.QuotationRead)
+def get_quotation(
+    quote_number: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    return get_quotation_or_404(db, quote_number)
+
+
+@router.get("/{quote_number}/pdf", response_class=Response)
+def download_quotation_pdf(
+    quote_number: str,
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """Serve the stored PDF; it is only re-rendered if the file has gone missing."""
+    quotation = get_quotation_or_404(db, quote_number)
+    path = artifact_path(config.MEDIA_QUOTATIONS_DIR, quotation.pdf_sha256 or "", ".pdf")
+    if not quotation.pdf_sha256 or not path.exists():
+        store_quotation_pdf(db, quotation)
+        db.commit()
+        path = artifact_path(config.MEDIA_QUOTATIONS_DIR, quotation.pdf_sha256, ".pdf")
+    return file_response(
+        path,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-            "Access-Control-Expose-Headers": "Content-Disposition",
-        }
+        etag=f'"{quotation.pdf_sha256}"',
+        if_none_match=if_none_match,
+        range_header=range_header,
+        headers=pdf_headers(quotation),
     )
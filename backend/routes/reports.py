@@ -1,120 +1,107 @@
-from datetime import date, datetime, timedelta
+import csv
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 import io
 from fpdf import FPDF
-from ..utils.timezone import now_cat, format_cat_time
+from ..utils.timezone import cat_day_start_utc, now_cat, format_cat_time
 from .. import config as app_config
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from .. import auth, models, schemas
-from ..database import get_db
+from ..database import SessionLocal, get_db
+from ..utils import render_pool
+from ..utils.artifacts import artifact_path, store_artifact
+from ..utils.http import file_response
+from ..utils.rollups import cat_day
 from typing import Optional
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 
 
-@router.get("/summary", response_model=schemas.ReportSummary)
-def get_summary(
-    db: Session = Depends(get_db),
-    _: models.User = Depends(auth.get_current_active_user),
-):
-    total_sales = db.query(func.coalesce(func.sum(models.Sale.total_amount), 0.0)).scalar() or 0.0
-    total_expenses = db.query(func.coalesce(func.sum(models.Expense.amount), 0.0)).scalar() or 0.0
-    total_profit = total_sales - total_expenses
-    total_orders = db.query(func.coalesce(func.count(models.Sale.id), 0)).scalar() or 0
-
-    today = date.today()
-    today_start = datetime.combine(today, datetime.min.time())
-    sales_today = (
-        db.query(func.coalesce(func.sum(models.Sale.total_amount), 0.0))
-        .filter(models.Sale.created_at >= today_start)
-        .scalar()
-        or 0.0
-    )
+SUMMARY_WINDOW_DAYS = 30
+TREND_DAYS = 7
+PERIODS = (("Daily", 1), ("Weekly", 7), ("Monthly", 30))
 
-    low_stock_products = (
-        db.query(models.Product)
-        .filter(models.Product.quantity <= models.Product.reorder_level)
-        .order_by(models.Product.quantity.asc())
-        .all()
-    )
-    low_stock = [f"{p.name} ({p.quantity})" for p in low_stock_products]
 
-    sales_vs_expenses = []
-    for days_ago in range(6, -1, -1):
-        target_day = today - timedelta(days=days_ago)
-        day_start = datetime.combine(target_day, datetime.min.time())
-        day_end = day_start + timedelta(days=1)
-
-        sales_total = (
-            db.query(func.coalesce(func.sum(models.Sale.total_amount), 0.0))
-            .filter(models.Sale.created_at >= day_start)
-            .filter(models.Sale.created_at < day_end)
-            .scalar()
-            or 0.0
-        )
-        expense_total = (
-            db.query(func.coalesce(func.sum(models.Expense.amount), 0.0))
-            .filter(models.Expense.expense_date == target_day)
-            .scalar()
-            or 0.0
-        )
-        sales_vs_expenses.append(
-            schemas.ProfitPoint(
-                period=target_day,
-                sales=sales_total,
-                expenses=expense_total,
-                profit=sales_total - expense_total,
-            )
-        )
+def _daily_totals(db: Session, start_date: date, end_date: Optional[date] = None) -> dict[date, tuple[float, float]]:
+    """Return ``{day: (sales, expenses)}`` from the daily rollup, from ``start_date`` onwards."""
+    query = db.query(
+        models.DailyRollup.day, models.DailyRollup.sales_total, models.DailyRollup.expense_total
+    ).filter(models.DailyRollup.day >= start_date)
+    if end_date is not None:
+        query = query.filter(models.DailyRollup.day <= end_date)
+    rows = query.all()
+    return {row.day: (float(row.sales_total or 0.0), float(row.expense_total or 0.0)) for row in rows}
 
-    def period_summary(label: str, days: int) -> schemas.PeriodSummary:
-        start_date = today - timedelta(days=days - 1)
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        sales_total = (
-            db.query(func.coalesce(func.sum(models.Sale.total_amount), 0.0))
-            .filter(models.Sale.created_at >= start_datetime)
-            .scalar()
-            or 0.0
-        )
-        expense_total = (
-            db.query(func.coalesce(func.sum(models.Expense.amount), 0.0))
-            .filter(models.Expense.expense_date >= start_date)
-            .scalar()
-            or 0.0
+
+BEST_SELLER_WINDOWS = {"all": None, "week": 7, "month": 30}
+
+
+def fetch_best_sellers(
+    db: Session,
+    window_days: Optional[int] = None,
+    limit: int = 5,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> list[schemas.BestSeller]:
+    """Top products by units sold, read from the per-product rollups.
+
+    All-time rankings are an indexed read of ``product_sales_totals``; windowed
+    rankings (the last ``window_days`` days, or ``start_date``..``end_date``)
+    only touch the ``product_daily_sales`` buckets inside the window.
+    """
+    if window_days is not None:
+        start_date = cat_day() - timedelta(days=window_days - 1)
+    if start_date is None and end_date is None:
+        ranked = (
+            db.query(
+                models.ProductSalesTotal.product_id.label("product_id"),
+                models.ProductSalesTotal.total_quantity.label("total_quantity"),
+                models.ProductSalesTotal.total_revenue.label("total_revenue"),
+            )
+            .join(models.Product, models.Product.id == models.ProductSalesTotal.product_id)
+            .filter(models.ProductSalesTotal.total_quantity > 0)
+            .order_by(models.ProductSalesTotal.total_quantity.desc())
         )
-        return schemas.PeriodSummary(
-            label=label,
-            sales=sales_total,
-            expenses=expense_total,
-            profit=sales_total - expense_total,
+    else:
+        ranked = db.query(
+            models.ProductDailySales.product_id.label("product_id"),
+            func.sum(models.ProductDailySales.quantity).label("total_quantity"),
+            func.sum(models.ProductDailySales.revenue).label("total_revenue"),
+        ).join(models.Product, models.Product.id == models.ProductDailySales.product_id)
+        if start_date is not None:
+            ranked = ranked.filter(models.ProductDailySales.day >= start_date)
+        if end_date is not None:
+            ranked = ranked.filter(models.ProductDailySales.day <= end_date)
+        ranked = (
+            ranked.group_by(models.ProductDailySales.product_id)
+            .having(func.sum(models.ProductDailySales.quantity) > 0)
+            .order_by(func.sum(models.ProductDailySales.quantity).desc())
         )
+    # Rollup rows can outlive their product (SQLite does not enforce the
+    # cascade), so only existing products may take a top-N slot.
+    ranked = ranked.limit(limit).subquery()
 
-    period_summaries = [
-        period_summary("Daily", 1),
-        period_summary("Weekly", 7),
-        period_summary("Monthly", 30),
-    ]
-
-    best_seller_rows = (
+    rows = (
         db.query(
             models.Product.id.label("product_id"),
             models.Product.name.label("product_name"),
             models.Product.price.label("unit_price"),
             models.Product.quantity.label("quantity_on_hand"),
-            func.coalesce(func.sum(models.SaleItem.quantity), 0).label("total_quantity"),
-            func.coalesce(func.sum(models.SaleItem.subtotal), 0.0).label("total_revenue"),
+            ranked.c.total_quantity,
+            ranked.c.total_revenue,
         )
-        .join(models.SaleItem, models.SaleItem.product_id == models.Product.id)
-        .join(models.Sale, models.Sale.id == models.SaleItem.sale_id)
-        .group_by(models.Product.id)
-        .order_by(func.sum(models.SaleItem.quantity).desc())
-        .limit(5)
+        .join(ranked, ranked.c.product_id == models.Product.id)
+        .order_by(ranked.c.total_quantity.desc())
         .all()
     )
-    best_sellers = [
+    return [
         schemas.BestSeller(
             product_id=row.product_id,
             product_name=row.product_name,
@@ -123,19 +110,109 @@ def get_summary(
             total_revenue=float(row.total_revenue or 0.0),
             status="In stock" if row.quantity_on_hand > 0 else "Out of stock",
         )
-        for row in best_seller_rows
+        for row in rows
     ]
 
+
+def build_report_summary(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> schemas.ReportSummary:
+    """Assemble the dashboard summary from the daily rollup and a few grouped queries.
+
+    Totals and the last 30 days are read from ``daily_rollups``, so their
+    cost depends on the number of days rather than the number of sales.
+    That window feeds today's sales, the 7-day trend and the
+    Daily/Weekly/Monthly periods.
+
+    With a ``start_date``/``end_date`` range (CAT days, inclusive) the totals,
+    best sellers and per-user sales cover only that range, the trend lists
+    every day in it, and "today" and the periods end on ``end_date``.
+    """
+    totals_query = db.query(
+        func.coalesce(func.sum(models.DailyRollup.sales_total), 0.0),
+        func.coalesce(func.sum(models.DailyRollup.order_count), 0),
+        func.coalesce(func.sum(models.DailyRollup.expense_total), 0.0),
+    )
+    if start_date is not None:
+        totals_query = totals_query.filter(models.DailyRollup.day >= start_date)
+    if end_date is not None:
+        totals_query = totals_query.filter(models.DailyRollup.day <= end_date)
+    total_sales, total_orders, total_expenses = totals_query.one()
+    total_sales = float(total_sales or 0.0)
+    total_expenses = float(total_expenses or 0.0)
+    total_orders = int(total_orders or 0)
+    total_profit = total_sales - total_expenses
+
+    today = end_date or cat_day()
+    window_start = today - timedelta(days=SUMMARY_WINDOW_DAYS - 1)
+    if start_date is not None:
+        window_start = min(window_start, start_date)
+    daily_totals = _daily_totals(db, window_start, today)
+
+    def window_totals(days: int) -> tuple[float, float]:
+        start_date = today - timedelta(days=days - 1)
+        sales_total = sum(sales for day, (sales, _) in daily_totals.items() if day >= start_date)
+        expense_total = sum(expenses for day, (_, expenses) in daily_totals.items() if day >= start_date)
+        return sales_total, expense_total
+
+    sales_today = window_totals(1)[0]
+
+    low_stock_products = (
+        db.query(models.Product)
+        .filter(models.Product.quantity <= models.Product.reorder_level)
+        .order_by(models.Product.quantity.asc())
+        .all()
+    )
+    low_stock = [f"{p.name} ({p.quantity})" for p in low_stock_products]
+
+    trend_days = (today - start_date).days + 1 if start_date is not None else TREND_DAYS
+    sales_vs_expenses = []
+    for days_ago in range(trend_days - 1, -1, -1):
+        target_day = today - timedelta(days=days_ago)
+        sales_total, expense_total = daily_totals.get(target_day, (0.0, 0.0))
+        sales_vs_expenses.append(
+            schemas.ProfitPoint(
+                period=target_day,
+                sales=sales_total,
+                expenses=expense_total,
+                profit=sales_total - expense_total,
+            )
+        )
+
+    period_summaries = []
+    for label, days in PERIODS:
+        sales_total, expense_total = window_totals(days)
+        period_summaries.append(
+            schemas.PeriodSummary(
+                label=label,
+                sales=sales_total,
+                expenses=expense_total,
+                profit=sales_total - expense_total,
+            )
+        )
+
+    if start_date is None and end_date is None:
+        best_sellers = fetch_best_sellers(db)
+    else:
+        best_sellers = fetch_best_sellers(db, start_date=start_date, end_date=today)
+
     # Sales by user (including deleted users)
-    user_sales_rows = (
-        db.query(
-            models.Sale.created_by_id,
-            models.User.full_name,
-            func.coalesce(func.sum(models.Sale.total_amount), 0.0).label("total_sales"),
-            func.count(models.Sale.id).label("total_transactions"),
+    user_sales_query = db.query(
+        models.Sale.created_by_id,
+        models.User.full_name,
+        func.coalesce(func.sum(models.Sale.total_amount), 0.0).label("total_sales"),
+        func.count(models.Sale.id).label("total_transactions"),
+    ).outerjoin(models.User, models.User.id == models.Sale.created_by_id)
+    if start_date is not None:
+        user_sales_query = user_sales_query.filter(models.Sale.created_at >= cat_day_start_utc(start_date))
+    if end_date is not None:
+        user_sales_query = user_sales_query.filter(
+            models.Sale.created_at < cat_day_start_utc(end_date + timedelta(days=1))
         )
-        .outerjoin(models.User, models.User.id == models.Sale.created_by_id)
-        .group_by(models.Sale.created_by_id, models.User.full_name)
+    user_sales_rows = (
+        user_sales_query.group_by(models.Sale.created_by_id, models.User.full_name)
         .order_by(func.sum(models.Sale.total_amount).desc())
         .all()
     )
@@ -165,6 +242,167 @@ def get_summary(
     )
 
 
+@router.get("/summary", response_model=schemas.ReportSummary)
+def get_summary(
+    db: Session = Depends(get_db),
+    _: models.User = Depends(auth.get_current_active_user),
+):
+    return build_report_summary(db)
+
+
+@router.get("/best-sellers", response_model=list[schemas.BestSeller])
+def get_best_sellers(
+    window: str = Query("all", pattern="^(all|week|month)$"),
+    limit: int = Query(5, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _: models.User = Depends(auth.get_current_active_user),
+):
+    return fetch_best_sellers(db, BEST_SELLER_WINDOWS[window], limit)
+
+
+def render_report_pdf(summary: schemas.ReportSummary, issued: str) -> bytes:
+    """Render the summary report to PDF bytes; runs in the rendering pool."""
+    # Create PDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=20)
+    
+    # Title
+    pdf.set_font("Arial", "B", 24)
+    pdf.set_text_color(59, 2, 112)  # Purple
+    pdf.cell(0, 15, "ANCESTRA BUSINESS REPORT", align="C", ln=True)
+    
+    # Subtitle
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(102, 102, 102)  # Gray
+    pdf.cell(0, 6, f"Financial Overview & Performance Analysis", align="C", ln=True)
+    pdf.cell(0, 6, issued, align="C", ln=True)
+    pdf.ln(10)
+    
+    # Summary cards
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(59, 2, 112)
+    y_pos = pdf.get_y()
+    
+    # Total Sales
+    pdf.set_xy(20, y_pos)
+    pdf.cell(55, 8, "Total Sales", border=1, align="C")
+    pdf.set_xy(20, y_pos + 8)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(55, 10, f"ZMW {summary.total_sales:,.2f}", border=1, align="C")
+    
+    # Total Expenses
+    pdf.set_xy(75, y_pos)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(60, 8, "Total Expenses", border=1, align="C")
+    pdf.set_xy(75, y_pos + 8)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(60, 10, f"ZMW {summary.total_expenses:,.2f}", border=1, align="C")
+    
+    # Net Profit
+    pdf.set_xy(135, y_pos)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(55, 8, "Net Profit", border=1, align="C")
+    pdf.set_xy(135, y_pos + 8)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(55, 10, f"ZMW {summary.total_profit:,.2f}", border=1, align="C")
+    
+    pdf.set_y(y_pos + 25)
+    
+    # Period Summaries
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(59, 2, 112)
+    pdf.cell(0, 8, "Period Summaries", ln=True)
+    
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_fill_color(111, 0, 255)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(50, 8, "Period", border=1, fill=True)
+    pdf.cell(45, 8, "Sales", border=1, fill=True, align="C")
+    pdf.cell(45, 8, "Expenses", border=1, fill=True, align="C")
+    pdf.cell(50, 8, "Profit", border=1, fill=True, align="C", ln=True)
+    
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    for p in summary.period_summaries:
+        pdf.cell(50, 8, p.label, border=1)
+        pdf.cell(45, 8, f"ZMW {p.sales:,.2f}", border=1, align="C")
+        pdf.cell(45, 8, f"ZMW {p.expenses:,.2f}", border=1, align="C")
+        pdf.cell(50, 8, f"ZMW {p.profit:,.2f}", border=1, align="C", ln=True)
+    
+    pdf.ln(8)
+    
+    # Sales vs Expenses (Last 7 Days)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(59, 2, 112)
+    pdf.cell(0, 8, "Sales vs Expenses (Last 7 Days)", ln=True)
+    
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_fill_color(111, 0, 255)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(50, 8, "Date", border=1, fill=True)
+    pdf.cell(45, 8, "Sales", border=1, fill=True, align="C")
+    pdf.cell(45, 8, "Expenses", border=1, fill=True, align="C")
+    pdf.cell(50, 8, "Profit", border=1, fill=True, align="C", ln=True)
+    
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    for pt in summary.sales_vs_expenses:
+        pdf.cell(50, 8, pt.period.strftime('%d %b %Y'), border=1)
+        pdf.cell(45, 8, f"ZMW {pt.sales:,.2f}", border=1, align="C")
+        pdf.cell(45, 8, f"ZMW {pt.expenses:,.2f}", border=1, align="C")
+        pdf.cell(50, 8, f"ZMW {pt.profit:,.2f}", border=1, align="C", ln=True)
+    
+    pdf.ln(8)
+    
+    # Best Sellers
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(59, 2, 112)
+    pdf.cell(0, 8, "Best Selling Products", ln=True)
+    
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_fill_color(111, 0, 255)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(60, 8, "Product", border=1, fill=True)
+    pdf.cell(30, 8, "Price", border=1, fill=True, align="C")
+    pdf.cell(25, 8, "Qty", border=1, fill=True, align="C")
+    pdf.cell(40, 8, "Revenue", border=1, fill=True, align="C")
+    pdf.cell(35, 8, "Status", border=1, fill=True, align="C", ln=True)
+    
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    for b in summary.best_sellers:
+        pdf.cell(60, 8, b.product_name[:25], border=1)
+        pdf.cell(30, 8, f"ZMW {b.unit_price:,.2f}", border=1, align="C")
+        pdf.cell(25, 8, str(b.total_quantity), border=1, align="C")
+        pdf.cell(40, 8, f"ZMW {b.total_revenue:,.2f}", border=1, align="C")
+        pdf.cell(35, 8, b.status, border=1, align="C", ln=True)
+    
+    pdf.ln(8)
+    
+    # Low Stock
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(59, 2, 112)
+    pdf.cell(0, 8, "Low Stock Items", ln=True)
+    
+    pdf.set_font("Arial", "", 10)
+    if summary.low_stock:
+        pdf.set_text_color(255, 78, 0)  # Orange
+        pdf.multi_cell(0, 6, ', '.join(summary.low_stock))
+    else:
+        pdf.set_text_color(5, 150, 105)  # Green
+        pdf.cell(0, 6, "All products are adequately stocked", ln=True)
+    
+    pdf.ln(6)
+    
+    # Additional Stats
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 6, f"Total Orders: {summary.total_orders}", ln=True)
+    pdf.cell(0, 6, f"Sales Today: ZMW {summary.sales_today:,.2f}", ln=True)
+    
+    return bytes(pdf.output())
+
 
 @router.get("/export", response_class=Response)
 def export_report(
@@ -172,150 +410,10 @@ def export_report(
         current_user: models.User = Depends(auth.get_current_active_user),
 ):
         """Generate a PDF report using fpdf2."""
-        summary = get_summary(db=db, _=current_user)
+        summary = build_report_summary(db)
         issued = now_cat().strftime("%d %b %Y %H:%M CAT")
 
-        # Create PDF
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=20)
-        
-        # Title
-        pdf.set_font("Arial", "B", 24)
-        pdf.set_text_color(59, 2, 112)  # Purple
-        pdf.cell(0, 15, "ANCESTRA BUSINESS REPORT", align="C", ln=True)
-        
-        # Subtitle
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(102, 102, 102)  # Gray
-        pdf.cell(0, 6, f"Financial Overview & Performance Analysis", align="C", ln=True)
-        pdf.cell(0, 6, issued, align="C", ln=True)
-        pdf.ln(10)
-        
-        # Summary cards
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(59, 2, 112)
-        y_pos = pdf.get_y()
-        
-        # Total Sales
-        pdf.set_xy(20, y_pos)
-        pdf.cell(55, 8, "Total Sales", border=1, align="C")
-        pdf.set_xy(20, y_pos + 8)
-        pdf.set_font("Arial", "B", 14)
-        pdf.cell(55, 10, f"ZMW {summary.total_sales:,.2f}", border=1, align="C")
-        
-        # Total Expenses
-        pdf.set_xy(75, y_pos)
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(60, 8, "Total Expenses", border=1, align="C")
-        pdf.set_xy(75, y_pos + 8)
-        pdf.set_font("Arial", "B", 14)
-        pdf.cell(60, 10, f"ZMW {summary.total_expenses:,.2f}", border=1, align="C")
-        
-        # Net Profit
-        pdf.set_xy(135, y_pos)
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(55, 8, "Net Profit", border=1, align="C")
-        pdf.set_xy(135, y_pos + 8)
-        pdf.set_font("Arial", "B", 14)
-        pdf.cell(55, 10, f"ZMW {summary.total_profit:,.2f}", border=1, align="C")
-        
-        pdf.set_y(y_pos + 25)
-        
-        # Period Summaries
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(59, 2, 112)
-        pdf.cell(0, 8, "Period Summaries", ln=True)
-        
-        pdf.set_font("Arial", "B", 10)
-        pdf.set_fill_color(111, 0, 255)
-        pdf.set_text_color(255, 255, 255)
-        pdf.cell(50, 8, "Period", border=1, fill=True)
-        pdf.cell(45, 8, "Sales", border=1, fill=True, align="C")
-        pdf.cell(45, 8, "Expenses", border=1, fill=True, align="C")
-        pdf.cell(50, 8, "Profit", border=1, fill=True, align="C", ln=True)
-        
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(0, 0, 0)
-        for p in summary.period_summaries:
-            pdf.cell(50, 8, p.label, border=1)
-            pdf.cell(45, 8, f"ZMW {p.sales:,.2f}", border=1, align="C")
-            pdf.cell(45, 8, f"ZMW {p.expenses:,.2f}", border=1, align="C")
-            pdf.cell(50, 8, f"ZMW {p.profit:,.2f}", border=1, align="C", ln=True)
-        
-        pdf.ln(8)
-        
-        # Sales vs Expenses (Last 7 Days)
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(59, 2, 112)
-        pdf.cell(0, 8, "Sales vs Expenses (Last 7 Days)", ln=True)
-        
-        pdf.set_font("Arial", "B", 10)
-        pdf.set_fill_color(111, 0, 255)
-        pdf.set_text_color(255, 255, 255)
-        pdf.cell(50, 8, "Date", border=1, fill=True)
-        pdf.cell(45, 8, "Sales", border=1, fill=True, align="C")
-        pdf.cell(45, 8, "Expenses", border=1, fill=True, align="C")
-        pdf.cell(50, 8, "Profit", border=1, fill=True, align="C", ln=True)
-        
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(0, 0, 0)
-        for pt in summary.sales_vs_expenses:
-            pdf.cell(50, 8, pt.period.strftime('%d %b %Y'), border=1)
-            pdf.cell(45, 8, f"ZMW {pt.sales:,.2f}", border=1, align="C")
-            pdf.cell(45, 8, f"ZMW {pt.expenses:,.2f}", border=1, align="C")
-            pdf.cell(50, 8, f"ZMW {pt.profit:,.2f}", border=1, align="C", ln=True)
-        
-        pdf.ln(8)
-        
-        # Best Sellers
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(59, 2, 112)
-        pdf.cell(0, 8, "Best Selling Products", ln=True)
-        
-        pdf.set_font("Arial", "B", 10)
-        pdf.set_fill_color(111, 0, 255)
-        pdf.set_text_color(255, 255, 255)
-        pdf.cell(60, 8, "Product", border=1, fill=True)
-        pdf.cell(30, 8, "Price", border=1, fill=True, align="C")
-        pdf.cell(25, 8, "Qty", border=1, fill=True, align="C")
-        pdf.cell(40, 8, "Revenue", border=1, fill=True, align="C")
-        pdf.cell(35, 8, "Status", border=1, fill=True, align="C", ln=True)
-        
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(0, 0, 0)
-        for b in summary.best_sellers:
-            pdf.cell(60, 8, b.product_name[:25], border=1)
-            pdf.cell(30, 8, f"ZMW {b.unit_price:,.2f}", border=1, align="C")
-            pdf.cell(25, 8, str(b.total_quantity), border=1, align="C")
-            pdf.cell(40, 8, f"ZMW {b.total_revenue:,.2f}", border=1, align="C")
-            pdf.cell(35, 8, b.status, border=1, align="C", ln=True)
-        
-        pdf.ln(8)
-        
-        # Low Stock
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(59, 2, 112)
-        pdf.cell(0, 8, "Low Stock Items", ln=True)
-        
-        pdf.set_font("Arial", "", 10)
-        if summary.low_stock:
-            pdf.set_text_color(255, 78, 0)  # Orange
-            pdf.multi_cell(0, 6, ', '.join(summary.low_stock))
-        else:
-            pdf.set_text_color(5, 150, 105)  # Green
-            pdf.cell(0, 6, "All products are adequately stocked", ln=True)
-        
-        pdf.ln(6)
-        
-        # Additional Stats
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 6, f"Total Orders: {summary.total_orders}", ln=True)
-        pdf.cell(0, 6, f"Sales Today: ZMW {summary.sales_today:,.2f}", ln=True)
-        
-        # Get PDF content
-        pdf_content = bytes(pdf.output())
+        pdf_content = render_pool.render(render_report_pdf, summary, issued)
 
         filename = f"ancestra_report_{now_cat().strftime('%Y%m%d')}.pdf"
         return Response(
@@ -327,3 +425,200 @@ def export_report(
                 }, 
                 status_code=status.HTTP_200_OK
         )
+
+
+EXPORT_MEDIA_TYPES = {"pdf": "application/pdf", "csv": "text/csv"}
+
+_export_executor: Optional[ThreadPoolExecutor] = None
+_export_executor_lock = threading.Lock()
+
+
+def _get_export_executor() -> ThreadPoolExecutor:
+    global _export_executor
+    with _export_executor_lock:
+        if _export_executor is None:
+            _export_executor = ThreadPoolExecutor(
+                max_workers=app_config.REPORT_EXPORT_WORKERS, thread_name_prefix="report-export"
+            )
+        return _export_executor
+
+
+def shutdown_export_workers() -> None:
+    global _export_executor
+    with _export_executor_lock:
+        if _export_executor is not None:
+            _export_executor.shutdown(wait=False, cancel_futures=True)
+            _export_executor = None
+
+
+def export_params_hash(export_format: str, start_date: Optional[date], end_date: Optional[date]) -> str:
+    key = f"{export_format}|{start_date or ''}|{end_date or ''}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive UTC timestamps.
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def render_report_csv(summary: schemas.ReportSummary) -> bytes:
+    """Per-day sales, expenses and profit for the exported range, with a totals row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Date", "Sales", "Expenses", "Profit"])
+    for point in summary.sales_vs_expenses:
+        writer.writerow(
+            [point.period.isoformat(), f"{point.sales:.2f}", f"{point.expenses:.2f}", f"{point.profit:.2f}"]
+        )
+    writer.writerow(
+        ["Total", f"{summary.total_sales:.2f}", f"{summary.total_expenses:.2f}", f"{summary.total_profit:.2f}"]
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def run_report_export(job_id: str) -> None:
+    """Build and store the artifact for a pending export; runs on an export worker thread."""
+    db = SessionLocal()
+    try:
+        claimed = (
+            db.query(models.ReportExport)
+            .filter(models.ReportExport.job_id == job_id, models.ReportExport.status == "pending")
+            .update({"status": "running", "started_at": datetime.now(timezone.utc)}, synchronize_session=False)
+        )
+        db.commit()
+        if not claimed:
+            return
+        job = db.query(models.ReportExport).filter(models.ReportExport.job_id == job_id).one()
+        try:
+            summary = build_report_summary(db, job.start_date, job.end_date)
+            if job.format == "pdf":
+                issued = now_cat().strftime("%d %b %Y %H:%M CAT")
+                content = render_pool.render(render_report_pdf, summary, issued, wait=True)
+            else:
+                content = render_report_csv(summary)
+            job.artifact_sha256 = store_artifact(app_config.MEDIA_REPORT_EXPORTS_DIR, content, f".{job.format}")
+            job.artifact_size = len(content)
+            job.status = "done"
+        except Exception as exc:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(getattr(exc, "detail", None) or exc) or exc.__class__.__name__
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    finally:
+        db.close()
+
+
+def to_report_export_read(job: models.ReportExport) -> schemas.ReportExportRead:
+    export = schemas.ReportExportRead.from_orm(job)
+    if job.status == "done":
+        export.download_url = f"{router.prefix}/exports/{job.job_id}/download"
+    return export
+
+
+def export_last_progress(job: models.ReportExport) -> Optional[datetime]:
+    """When the job last moved: queued while pending, claimed while running, else finished."""
+    if job.status == "pending":
+        moment = job.created_at
+    elif job.status == "running":
+        moment = job.started_at or job.created_at
+    else:
+        moment = job.finished_at or job.created_at
+    return _as_utc(moment)
+
+
+def export_is_stale(job: models.ReportExport, now: datetime) -> bool:
+    """A pending or running job whose worker has not moved it on for too long."""
+    stale_before = now - timedelta(seconds=app_config.REPORT_EXPORT_STALE_SECONDS)
+    return job.status in {"pending", "running"} and export_last_progress(job) < stale_before
+
+
+def get_export_or_404(db: Session, job_id: str) -> models.ReportExport:
+    job = db.query(models.ReportExport).filter(models.ReportExport.job_id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    if export_is_stale(job, datetime.now(timezone.utc)):
+        # The worker that owned the job went away (restart or crash).
+        job.status = "failed"
+        job.error = "Export was interrupted, please submit it again"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    return job
+
+
+@router.post("/exports", response_model=schemas.ReportExportRead, status_code=status.HTTP_202_ACCEPTED)
+def submit_report_export(
+    export_in: schemas.ReportExportCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """Queue a report export, or return an identical one that is still in progress or recently done."""
+    if export_in.start_date and export_in.end_date and export_in.end_date < export_in.start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+
+    params_hash = export_params_hash(export_in.format, export_in.start_date, export_in.end_date)
+    now = datetime.now(timezone.utc)
+    existing = (
+        db.query(models.ReportExport)
+        .filter(models.ReportExport.params_hash == params_hash, models.ReportExport.status != "failed")
+        .order_by(models.ReportExport.created_at.desc())
+        .first()
+    )
+    if existing and not export_is_stale(existing, now):
+        fresh_after = now - timedelta(seconds=app_config.REPORT_EXPORT_FRESHNESS_SECONDS)
+        if existing.status != "done" or export_last_progress(existing) >= fresh_after:
+            return to_report_export_read(existing)
+
+    job = models.ReportExport(
+        job_id=uuid4().hex,
+        format=export_in.format,
+        start_date=export_in.start_date,
+        end_date=export_in.end_date,
+        params_hash=params_hash,
+        requested_by_id=current_user.id,
+    )
+    db.add(job)
+    db.commit()
+    _get_export_executor().submit(run_report_export, job.job_id)
+    return to_report_export_read(job)
+
+
+@router.get("/exports/{job_id}", response_model=schemas.ReportExportRead)
+def get_report_export(
+    job_id: str,
+    db: Session = Depends(get_db),
+    _: models.User = Depends(auth.get_current_active_user),
+):
+    return to_report_export_read(get_export_or_404(db, job_id))
+
+
+@router.get("/exports/{job_id}/download", response_class=Response)
+def download_report_export(
+    job_id: str,
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_db),
+    _: models.User = Depends(auth.get_current_active_user),
+):
+    job = get_export_or_404(db, job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Export is {job.status}")
+    path = artifact_path(app_config.MEDIA_REPORT_EXPORTS_DIR, job.artifact_sha256, f".{job.format}")
+    if not path.exists():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export file is no longer available")
+
+    period = "_".join(day.strftime("%Y%m%d") for day in (job.start_date, job.end_date) if day)
+    filename = f"ancestra_report_{period or _as_utc(job.created_at).strftime('%Y%m%d')}.{job.format}"
+    return file_response(
+        path,
+        media_type=EXPORT_MEDIA_TYPES[job.format],
+        etag=f'"{job.artifact_sha256}"',
+        if_none_match=if_none_match,
+        range_header=range_header,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Access-Control-Expose-Headers": "Content-Disposition, ETag",
+        },
+    )
@@ -1,24 +1,34 @@
 import base64
-import mimetypes
+from collections import defaultdict
 from datetime import datetime
 from io import BytesIO
 from typing import Optional
-from uuid import uuid4
 
 import qrcode
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from ..utils.timezone import now_cat, format_cat_time
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import String, and_, bindparam, func, insert, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from .. import auth, config, models, schemas
-from ..database import get_db
+from ..database import SessionLocal, get_db
+from ..utils import idempotency, render_pool
 from ..utils.activity import log_activity
+from ..utils.csv_stream import EXPORT_BATCH_SIZE, csv_streaming_response
+from ..utils.http import etag_matches
+from ..utils.logo_cache import logo_data_uri
+from ..utils.receipt_cache import get_cached_receipt, receipt_cache_key, store_receipt
+from ..utils.rollups import cat_day, record_product_sales, record_sale
+from ..utils.sequences import BlockAllocator
 
 router = APIRouter(prefix="/api/sales", tags=["sales"])
 
 
 SALE_CREATION_ROLES = {"owner", "manager", "cashier"}
+STREAM_BATCH_SIZE = 500
 PAYMENT_METHOD_LABELS = {
     "cash": "Cash",
     "bank_transfer": "Bank Transfer",
@@ -51,10 +61,7 @@ def resolve_logo_src(settings: models.ReceiptSettings) -> Optional[str]:
     if logo_url.startswith(config.MEDIA_URL):
         relative_path = logo_url[len(config.MEDIA_URL) :].lstrip("/\\")
         logo_path = config.MEDIA_ROOT / relative_path
-        if logo_path.exists():
-            mime_type = mimetypes.guess_type(logo_path.name)[0] or "image/png"
-            encoded = base64.b64encode(logo_path.read_bytes()).decode("utf-8")
-            return f"data:{mime_type};base64,{encoded}"
+        return logo_data_uri(logo_path)
     return None
 
 
@@ -63,8 +70,27 @@ def ensure_sale_role(user: models.User) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
 
+def _seed_receipt_sequence(conn: Connection, name: str) -> int:
+    """Start a new day's sequence after any numeric receipt already issued that day."""
+    prefix = f"AB-{name.split(':', 1)[1]}-"
+    numbers = conn.execute(
+        select(models.Sale.receipt_number).where(models.Sale.receipt_number.like(f"{prefix}%"))
+    ).scalars()
+    suffixes = [int(number[len(prefix) :]) for number in numbers if number[len(prefix) :].isdigit()]
+    return max(suffixes, default=0)
+
+
+_receipt_sequence = BlockAllocator(config.RECEIPT_BLOCK_SIZE, seed=_seed_receipt_sequence)
+
+
+def generate_receipt_numbers(count: int) -> list[str]:
+    """Sequential ``AB-YYYYMMDD-000123`` numbers, numbered per CAT day."""
+    day = now_cat().strftime("%Y%m%d")
+    return [f"AB-{day}-{value:06d}" for value in _receipt_sequence.take(f"receipt:{day}", count)]
+
+
 def generate_receipt_number() -> str:
-    return f"AB-{now_cat().strftime('%Y%m%d')}-{uuid4().hex[:6].upper()}"
+    return generate_receipt_numbers(1)[0]
 
 
 def encode_qr_code(payload: str) -> str:
@@ -79,9 +105,10 @@ def encode_qr_code(payload: str) -> str:
 
 
 def build_receipt_markup(
-    sale: models.Sale,
+    sale: schemas.SaleRead,
     qr_code_url: str,
-    receipt_settings: models.ReceiptSettings,
+    receipt_settings: schemas.ReceiptSettingsRead,
+    logo_src: Optional[str],
 ) -> str:
     issued_at = format_cat_time(sale.created_at, "%d %b %Y at %H:%M")
     payment_method = PAYMENT_METHOD_LABELS.get(
@@ -90,13 +117,12 @@ def build_receipt_markup(
     company_name = receipt_settings.company_name or "Ancestra Business"
     company_tagline = receipt_settings.company_tagline or "Small Business Sales Receipt"
     footer_message = receipt_settings.footer_message or "Thank you for supporting our business!"
-    logo_src = resolve_logo_src(receipt_settings)
     logo_markup = f'<img src="{logo_src}" alt="{company_name} logo" class="logo" />' if logo_src else ""
     tagline_markup = f'<p class="tagline">{company_tagline}</p>' if company_tagline else ""
     items_rows = "".join(
         f"""
         <tr>
-            <td>{item.product.name if item.product else 'Unknown'}</td>
+            <td>{item.product_name or 'Unknown'}</td>
             <td class="align-center">{item.quantity}</td>
             <td class="align-right">ZMW {item.unit_price:.2f}</td>
             <td class="align-right">ZMW {item.subtotal:.2f}</td>
@@ -257,6 +283,108 @@ def build_receipt_markup(
     """
 
 
+def render_receipt(
+    sale: schemas.SaleRead,
+    receipt_settings: schemas.ReceiptSettingsRead,
+    logo_src: Optional[str],
+) -> tuple[str, str]:
+    """Return the receipt markup and its QR code data URI; runs in the rendering pool."""
+    # Encode receipt details in QR code
+    qr_payload = f"{sale.receipt_number}|{sale.total_amount:.2f}|{sale.created_at.isoformat()}"
+    qr_code_url = encode_qr_code(qr_payload)
+    return build_receipt_markup(sale, qr_code_url, receipt_settings, logo_src), qr_code_url
+
+
+def price_sale_items(
+    items: list[schemas.SaleItemCreate],
+    products: dict[int, models.Product],
+    available: dict[int, int],
+) -> tuple[list[tuple[models.Product, int, float, float]], float, dict[int, int]]:
+    """Validate a basket against ``available`` stock and price each line.
+
+    Returns ``(lines, total_amount, requested)`` where lines are
+    ``(product, quantity, unit_price, subtotal)`` and ``requested`` is the
+    quantity asked for per product id. ``available`` is left untouched.
+    """
+    lines = []
+    total_amount = 0.0
+    requested: dict[int, int] = defaultdict(int)
+    for item in items:
+        product = products.get(item.product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail=f"Product {item.product_id} not found")
+        requested[product.id] += item.quantity
+        if available.get(product.id, 0) < requested[product.id]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for {product.name}",
+            )
+        unit_price = item.price_override if item.price_override is not None else product.price
+        subtotal = unit_price * item.quantity
+        total_amount += subtotal
+        lines.append((product, item.quantity, unit_price, subtotal))
+    return lines, total_amount, requested
+
+
+def try_reserve_stock(db: Session, requested: dict[int, int]) -> Optional[int]:
+    """Atomically decrement stock for every product in ``requested``.
+
+    Each decrement is a conditional ``UPDATE ... WHERE quantity >= :n`` so that
+    concurrent tills (or workers) can never oversell or lose an update; the row
+    lock it takes is held until the caller commits. Products are updated in id
+    order to keep lock acquisition deadlock-free.
+
+    Returns ``None`` on success. Otherwise returns the id of the first product
+    that is short, after putting back the units already taken for this call,
+    so the caller's transaction can carry on with other sales.
+    """
+    reserved: list[int] = []
+    for product_id in sorted(requested):
+        quantity = requested[product_id]
+        result = db.execute(
+            update(models.Product)
+            .where(models.Product.id == product_id, models.Product.quantity >= quantity)
+            .values(quantity=models.Product.quantity - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            for taken_id in reserved:
+                db.execute(
+                    update(models.Product)
+                    .where(models.Product.id == taken_id)
+                    .values(quantity=models.Product.quantity + requested[taken_id])
+                    .execution_options(synchronize_session=False)
+                )
+            return product_id
+        reserved.append(product_id)
+    return None
+
+
+def reserve_stock(db: Session, requested: dict[int, int], products: dict[int, models.Product]) -> None:
+    """Like ``try_reserve_stock`` but rolls back and raises a 400 when stock is short."""
+    short_product_id = try_reserve_stock(db, requested)
+    if short_product_id is not None:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient stock for {products[short_product_id].name}",
+        )
+
+
+def line_item_reads(lines: list[tuple[models.Product, int, float, float]]) -> list[schemas.SaleItemRead]:
+    """Response items for priced ``(product, quantity, unit_price, subtotal)`` lines."""
+    return [
+        schemas.SaleItemRead(
+            product_id=product.id,
+            product_name=product.name,
+            quantity=quantity,
+            unit_price=unit_price,
+            subtotal=subtotal,
+        )
+        for product, quantity, unit_price, subtotal in lines
+    ]
+
+
 def to_sale_read(sale: models.Sale) -> schemas.SaleRead:
     return schemas.SaleRead(
         id=sale.id,
@@ -281,58 +409,43 @@ def to_sale_read(sale: models.Sale) -> schemas.SaleRead:
 @router.post("/", response_model=schemas.SaleRead, status_code=status.HTTP_201_CREATED)
 def create_sale(
     sale_in: schemas.SaleCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     ensure_sale_role(current_user)
+    idempotency_key = idempotency.validate_key(idempotency_key)
+    if idempotency_key:
+        replay = idempotency.find_response(db, "sales.create", current_user.id, idempotency_key)
+        if replay is not None:
+            return replay
     if not sale_in.items:
         raise HTTPException(status_code=400, detail="Sale must include items")
 
+    product_ids = {item.product_id for item in sale_in.items}
+    products = {
+        product.id: product
+        for product in db.query(models.Product).filter(models.Product.id.in_(product_ids))
+    }
+    available = {product.id: product.quantity for product in products.values()}
+    lines, total_amount, requested = price_sale_items(sale_in.items, products, available)
+
     sale = models.Sale(
         customer_name=sale_in.customer_name,
         payment_method=sale_in.payment_method,
         created_by_id=current_user.id,
     )
-    total_amount = 0.0
-
-    for item in sale_in.items:
-        product = db.get(models.Product, item.product_id)
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Product {item.product_id} not found")
-        if product.quantity < item.quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock for {product.name}",
-            )
-        unit_price = item.price_override if item.price_override is not None else product.price
-        subtotal = unit_price * item.quantity
-        total_amount += subtotal
-        product.quantity -= item.quantity
-
-        sale_item = models.SaleItem(
-            product_id=product.id,
-            quantity=item.quantity,
-            unit_price=unit_price,
-            subtotal=subtotal,
-        )
-        sale.items.append(sale_item)
 
-    sale.total_amount = total_amount
+    # Numbers come from a separate short transaction, so take one before this
+    # session starts writing (SQLite allows a single writer at a time).
     sale.receipt_number = generate_receipt_number()
-    while (
-        db.query(models.Sale)
-        .filter(models.Sale.receipt_number == sale.receipt_number)
-        .first()
-    ):
-        sale.receipt_number = generate_receipt_number()
+    reserve_stock(db, requested, products)
+    sale.total_amount = total_amount
     db.add(sale)
-    db.commit()
-    db.refresh(sale)
-    sale = (
-        db.query(models.Sale)
-        .options(joinedload(models.Sale.items).joinedload(models.SaleItem.product))
-        .filter(models.Sale.id == sale.id)
-        .first()
+    sale_day = cat_day()
+    record_sale(db, sale_day, sale.payment_method, total_amount)
+    record_product_sales(
+        db, sale_day, [(product.id, quantity, subtotal) for product, quantity, _, subtotal in lines]
     )
     log_activity(
         db,
@@ -340,21 +453,230 @@ def create_sale(
         "sale_created",
         f"Recorded sale {sale.receipt_number} for ZMW {sale.total_amount:.2f}",
     )
-    return to_sale_read(sale)
+    # Flushing fetches the id and created_at (eager_defaults), so the response is
+    # built from the objects in memory instead of re-querying after commit.
+    db.flush()
+    # One executemany for the lines: ORM-managed items would each need their
+    # own INSERT ... RETURNING on SQLite.
+    db.execute(
+        insert(models.SaleItem),
+        [
+            {
+                "sale_id": sale.id,
+                "product_id": product.id,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "subtotal": subtotal,
+            }
+            for product, quantity, unit_price, subtotal in lines
+        ],
+    )
+    sale_read = schemas.SaleRead(
+        id=sale.id,
+        customer_name=sale.customer_name,
+        created_at=sale.created_at,
+        total_amount=sale.total_amount,
+        receipt_number=sale.receipt_number,
+        payment_method=sale.payment_method,
+        items=line_item_reads(lines),
+    )
+    if idempotency_key:
+        idempotency.store_response(
+            db, "sales.create", current_user.id, idempotency_key, status.HTTP_201_CREATED, sale_read.json()
+        )
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race; replay its response.
+        db.rollback()
+        replay = idempotency_key and idempotency.find_response(
+            db, "sales.create", current_user.id, idempotency_key
+        )
+        if not replay:
+            raise
+        return replay
+    return sale_read
 
 
-@router.get("/", response_model=list[schemas.SaleRead])
-def list_sales(
-    start_date: Optional[datetime] = Query(None),
-    end_date: Optional[datetime] = Query(None),
-    customer: Optional[str] = Query(None),
-    product_id: Optional[int] = Query(None),
-    mine: bool = Query(False),
+@router.post("/batch", response_model=schemas.SaleBatchResult)
+def create_sales_batch(
+    batch: schemas.SaleBatchCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
-    query = db.query(models.Sale).options(joinedload(models.Sale.items).joinedload(models.SaleItem.product))
+    """Ingest queued offline sales in one transaction, reporting an outcome per sale.
 
+    ``client_key`` makes replays safe: sales already stored under the same key
+    are reported as duplicates instead of being recorded twice.
+    """
+    ensure_sale_role(current_user)
+    results: dict[int, schemas.SaleBatchItemResult] = {}
+
+    keys = [entry.client_key for entry in batch.sales]
+    existing_sales = {
+        sale.client_key: sale
+        for sale in db.query(models.Sale)
+        .options(selectinload(models.Sale.items).joinedload(models.SaleItem.product))
+        .filter(models.Sale.client_key.in_(set(keys)))
+    }
+    product_ids = {item.product_id for entry in batch.sales for item in entry.items}
+    # Row locks (where the database has them) keep ``available`` exact until
+    # commit; the conditional decrements below still guard databases without.
+    products = {
+        product.id: product
+        for product in db.query(models.Product)
+        .filter(models.Product.id.in_(product_ids))
+        .order_by(models.Product.id)
+        .with_for_update()
+    }
+    available = {product.id: product.quantity for product in products.values()}
+
+    accepted = []
+    seen_keys: set[str] = set()
+    for index, entry in enumerate(batch.sales):
+        if entry.client_key in existing_sales:
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key,
+                status="duplicate",
+                sale=to_sale_read(existing_sales[entry.client_key]),
+            )
+            continue
+        if entry.client_key in seen_keys:
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key, status="failed", error="Duplicate client_key in batch"
+            )
+            continue
+        seen_keys.add(entry.client_key)
+        if not entry.items:
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key, status="failed", error="Sale must include items"
+            )
+            continue
+        try:
+            lines, total_amount, requested = price_sale_items(entry.items, products, available)
+        except HTTPException as exc:
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key, status="failed", error=exc.detail
+            )
+            continue
+        # Reserve per sale so stock sold elsewhere since the snapshot fails only
+        # the sales that can no longer be filled.
+        short_product_id = try_reserve_stock(db, requested)
+        if short_product_id is not None:
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key,
+                status="failed",
+                error=f"Insufficient stock for {products[short_product_id].name}",
+            )
+            continue
+        for product_id, quantity in requested.items():
+            available[product_id] -= quantity
+        accepted.append((index, entry, lines, total_amount))
+
+    if accepted:
+        receipt_numbers = generate_receipt_numbers(len(accepted))
+        sale_rows = [
+            {
+                "customer_name": entry.customer_name,
+                "payment_method": entry.payment_method,
+                "created_by_id": current_user.id,
+                "client_key": entry.client_key,
+                "total_amount": total_amount,
+                "receipt_number": receipt_number,
+            }
+            for (_, entry, _, total_amount), receipt_number in zip(accepted, receipt_numbers)
+        ]
+        try:
+            # Rows are matched back by client_key: asking for RETURNING in parameter
+            # order makes SQLite fall back to one INSERT per row.
+            inserted = {
+                client_key: (sale_id, created_at)
+                for sale_id, created_at, client_key in db.execute(
+                    insert(models.Sale).returning(
+                        models.Sale.id, models.Sale.created_at, models.Sale.client_key
+                    ),
+                    sale_rows,
+                )
+            }
+        except IntegrityError as exc:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Some sales in this batch were recorded concurrently; retry the batch.",
+            ) from exc
+
+        item_rows = []
+        sale_day = cat_day()
+        totals_by_method: dict[str, list] = defaultdict(lambda: [0.0, 0])
+        for (index, entry, lines, total_amount), sale_row in zip(accepted, sale_rows):
+            sale_id, created_at = inserted[entry.client_key]
+            item_rows.extend(
+                {
+                    "sale_id": sale_id,
+                    "product_id": product.id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "subtotal": subtotal,
+                }
+                for product, quantity, unit_price, subtotal in lines
+            )
+            totals_by_method[entry.payment_method][0] += total_amount
+            totals_by_method[entry.payment_method][1] += 1
+            results[index] = schemas.SaleBatchItemResult(
+                client_key=entry.client_key,
+                status="created",
+                sale=schemas.SaleRead(
+                    id=sale_id,
+                    customer_name=entry.customer_name,
+                    payment_method=entry.payment_method,
+                    created_at=created_at,
+                    total_amount=total_amount,
+                    receipt_number=sale_row["receipt_number"],
+                    items=line_item_reads(lines),
+                ),
+            )
+        db.execute(insert(models.SaleItem), item_rows)
+
+        for payment_method, (amount, orders) in totals_by_method.items():
+            record_sale(db, sale_day, payment_method, amount, orders=orders)
+        record_product_sales(
+            db,
+            sale_day,
+            [(row["product_id"], row["quantity"], row["subtotal"]) for row in item_rows],
+        )
+        log_activity(
+            db,
+            current_user.id,
+            "sale_batch_imported",
+            f"Imported {len(accepted)} queued sales for ZMW {sum(row['total_amount'] for row in sale_rows):.2f}",
+        )
+        db.commit()
+
+    ordered = [results[index] for index in range(len(batch.sales))]
+    return schemas.SaleBatchResult(
+        created=sum(1 for result in ordered if result.status == "created"),
+        duplicates=sum(1 for result in ordered if result.status == "duplicate"),
+        failed=sum(1 for result in ordered if result.status == "failed"),
+        results=ordered,
+    )
+
+
+def sales_with_product(product_id: int):
+    """Semi-join on ``sale_items`` so matching sales are never multiplied per line item.
+
+    Served from the ``(product_id, sale_id)`` index on ``sale_items``.
+    """
+    return select(models.SaleItem.sale_id).where(models.SaleItem.product_id == product_id)
+
+
+def apply_sale_filters(
+    query,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    customer: Optional[str] = None,
+    product_id: Optional[int] = None,
+    created_by_id: Optional[int] = None,
+):
     if start_date:
         query = query.filter(models.Sale.created_at >= start_date)
     if end_date:
@@ -362,49 +684,309 @@ def list_sales(
     if customer:
         query = query.filter(func.lower(models.Sale.customer_name) == customer.lower())
     if product_id:
-        query = query.join(models.Sale.items).filter(models.SaleItem.product_id == product_id)
+        query = query.filter(models.Sale.id.in_(sales_with_product(product_id)))
+    if created_by_id is not None:
+        query = query.filter(models.Sale.created_by_id == created_by_id)
+    return query
+
+
+def encode_sale_cursor(sale: models.Sale) -> str:
+    raw = f"{sale.created_at.isoformat()}|{sale.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_sale_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, sale_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(sale_id)
+    except (ValueError, UnicodeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _cursor_timestamp(db: Session, created_at: datetime):
+    # SQLite keeps CURRENT_TIMESTAMP defaults as "YYYY-MM-DD HH:MM:SS" text, so the
+    # cursor has to be compared in that same format for equality to hold.
+    if db.get_bind().dialect.name == "sqlite":
+        value = created_at.replace(tzinfo=None).strftime("%Y-%m-%d %H:%M:%S")
+        if created_at.microsecond:
+            value += f".{created_at.microsecond:06d}"
+        return bindparam("cursor_created_at", value, type_=String)
+    return created_at
+
+
+def paginate_sales(
+    query, db: Session, cursor: Optional[str], limit: int, descending: bool = True
+) -> tuple[list[models.Sale], Optional[str]]:
+    """Return one keyset page ordered by ``(created_at, id)``, newest first unless ``descending`` is false."""
+    if cursor:
+        created_at, sale_id = decode_sale_cursor(cursor)
+        cursor_created_at = _cursor_timestamp(db, created_at)
+        if descending:
+            after_cursor = or_(
+                models.Sale.created_at < cursor_created_at,
+                and_(models.Sale.created_at == cursor_created_at, models.Sale.id < sale_id),
+            )
+        else:
+            after_cursor = or_(
+                models.Sale.created_at > cursor_created_at,
+                and_(models.Sale.created_at == cursor_created_at, models.Sale.id > sale_id),
+            )
+        query = query.filter(after_cursor)
+    if descending:
+        ordering = (models.Sale.created_at.desc(), models.Sale.id.desc())
+    else:
+        ordering = (models.Sale.created_at, models.Sale.id)
+    sales = query.order_by(*ordering).limit(limit + 1).all()
+    next_cursor = encode_sale_cursor(sales[limit - 1]) if len(sales) > limit else None
+    return sales[:limit], next_cursor
 
-    # If mine is true, restrict results to the current user's sales
-    if mine:
-        query = query.filter(models.Sale.created_by_id == current_user.id)
 
+@router.get("/", response_model=list[schemas.SaleRead])
+def list_sales(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    customer: Optional[str] = Query(None),
+    product_id: Optional[int] = Query(None),
+    mine: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    query = db.query(models.Sale).options(joinedload(models.Sale.items).joinedload(models.SaleItem.product))
+    # If mine is true, restrict results to the current user's sales
+    query = apply_sale_filters(
+        query, start_date, end_date, customer, product_id, current_user.id if mine else None
+    )
     sales = query.order_by(models.Sale.created_at.desc()).all()
     return [to_sale_read(sale) for sale in sales]
 
 
+@router.get("/page", response_model=schemas.SalePage)
+def list_sales_page(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    customer: Optional[str] = Query(None),
+    product_id: Optional[int] = Query(None),
+    mine: bool = Query(False),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    include_total: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """Keyset-paginated sales; pass ``next_cursor`` back as ``cursor`` for the next page."""
+    query = apply_sale_filters(
+        db.query(models.Sale), start_date, end_date, customer, product_id, current_user.id if mine else None
+    )
+    total = query.order_by(None).count() if include_total else None
+    sales, next_cursor = paginate_sales(
+        query.options(selectinload(models.Sale.items).joinedload(models.SaleItem.product)),
+        db,
+        cursor,
+        limit,
+    )
+    return schemas.SalePage(
+        items=[to_sale_read(sale) for sale in sales],
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+def _stream_sales_ndjson(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    customer: Optional[str],
+    product_id: Optional[int],
+    created_by_id: Optional[int],
+):
+    # The request-scoped session is closed before the body is streamed, so the
+    # generator owns its own session for the lifetime of the response.
+    db = SessionLocal()
+    try:
+        query = apply_sale_filters(
+            db.query(models.Sale), start_date, end_date, customer, product_id, created_by_id
+        ).options(selectinload(models.Sale.items).joinedload(models.SaleItem.product))
+        # Each keyset page is read and serialised in full, and its transaction
+        # ended, before it is sent; a slow consumer must not hold a cursor (on
+        # SQLite, the shared lock) open for the whole response.
+        cursor = None
+        while True:
+            sales, cursor = paginate_sales(query, db, cursor, STREAM_BATCH_SIZE)
+            lines = "".join(to_sale_read(sale).json() + "\n" for sale in sales)
+            db.rollback()
+            if lines:
+                yield lines
+            if cursor is None:
+                return
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+def stream_sales(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    customer: Optional[str] = Query(None),
+    product_id: Optional[int] = Query(None),
+    mine: bool = Query(False),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """Stream matching sales as newline-delimited JSON for bulk consumers."""
+    return StreamingResponse(
+        _stream_sales_ndjson(start_date, end_date, customer, product_id, current_user.id if mine else None),
+        media_type="application/x-ndjson",
+    )
+
+
+SALE_EXPORT_HEADER = [
+    "sale_id",
+    "receipt_number",
+    "created_at",
+    "customer_name",
+    "payment_method",
+    "created_by",
+    "sale_total",
+    "product_id",
+    "product_name",
+    "quantity",
+    "unit_price",
+    "subtotal",
+]
+
+
+@router.get("/export")
+def export_sales(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    customer: Optional[str] = Query(None),
+    product_id: Optional[int] = Query(None),
+    mine: bool = Query(False),
+    gzip: bool = Query(False),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """Stream matching sales as CSV, one row per sale item (CAT timestamps)."""
+    created_by_id = current_user.id if mine else None
+
+    def rows(db: Session):
+        sale_keys = apply_sale_filters(
+            db.query(models.Sale.id, models.Sale.created_at),
+            start_date,
+            end_date,
+            customer,
+            product_id,
+            created_by_id,
+        )
+        line_query = (
+            db.query(
+                models.Sale.id,
+                models.Sale.receipt_number,
+                models.Sale.created_at,
+                models.Sale.customer_name,
+                models.Sale.payment_method,
+                models.User.full_name,
+                models.Sale.total_amount,
+                models.SaleItem.product_id,
+                models.Product.name,
+                models.SaleItem.quantity,
+                models.SaleItem.unit_price,
+                models.SaleItem.subtotal,
+            )
+            .join(models.SaleItem, models.SaleItem.sale_id == models.Sale.id)
+            .outerjoin(models.Product, models.Product.id == models.SaleItem.product_id)
+            .outerjoin(models.User, models.User.id == models.Sale.created_by_id)
+        )
+        # Page through the matching sales by keyset and fetch each page's lines in
+        # full before yielding, so no read stays open while the client downloads.
+        cursor = None
+        while True:
+            page, cursor = paginate_sales(sale_keys, db, cursor, EXPORT_BATCH_SIZE, descending=False)
+            lines = []
+            if page:
+                lines = (
+                    line_query.filter(models.Sale.id.in_([sale.id for sale in page]))
+                    .order_by(models.Sale.created_at, models.Sale.id, models.SaleItem.id)
+                    .all()
+                )
+            db.rollback()
+            for line in lines:
+                yield [
+                    line.id,
+                    line.receipt_number,
+                    format_cat_time(line.created_at, "%Y-%m-%d %H:%M:%S") if line.created_at else "",
+                    line.customer_name or "",
+                    line.payment_method,
+                    line.full_name or "",
+                    f"{line.total_amount:.2f}",
+                    line.product_id or "",
+                    line.name or "",
+                    line.quantity,
+                    f"{line.unit_price:.2f}",
+                    f"{line.subtotal:.2f}",
+                ]
+            if cursor is None:
+                return
+
+    return csv_streaming_response("sales.csv", SALE_EXPORT_HEADER, rows, gzip)
+
+
 @router.get("/{sale_id}/receipt", response_model=schemas.SaleReceipt)
 def get_sale_receipt(
     sale_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     _: models.User = Depends(auth.get_current_active_user),
 ):
-    sale = (
-        db.query(models.Sale)
-        .options(joinedload(models.Sale.items).joinedload(models.SaleItem.product))
+    # The product names on the receipt, read before trusting If-None-Match or
+    # the cache: no rows means the sale does not exist, and a renamed product
+    # changes the key.
+    lines = (
+        db.query(models.Product.name)
+        .select_from(models.Sale)
+        .outerjoin(models.SaleItem, models.SaleItem.sale_id == models.Sale.id)
+        .outerjoin(models.Product, models.Product.id == models.SaleItem.product_id)
         .filter(models.Sale.id == sale_id)
-        .first()
+        .order_by(models.SaleItem.id)
+        .all()
     )
-    if not sale:
+    if not lines:
         raise HTTPException(status_code=404, detail="Sale not found")
-
     receipt_settings = get_receipt_settings(db)
-    
-    # Encode receipt details in QR code
-    qr_payload = f"{sale.receipt_number}|{sale.total_amount:.2f}|{sale.created_at.isoformat()}"
-    
-    
-    qr_code_url = encode_qr_code(qr_payload)
-    html = build_receipt_markup(sale, qr_code_url, receipt_settings)
-    sale_read = to_sale_read(sale)
+    cache_key = receipt_cache_key(sale_id, receipt_settings, [name or "" for name, in lines])
+    etag = f'"{cache_key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    payload = get_cached_receipt(cache_key)
+    if payload is None:
+        sale = (
+            db.query(models.Sale)
+            .options(joinedload(models.Sale.items).joinedload(models.SaleItem.product))
+            .filter(models.Sale.id == sale_id)
+            .first()
+        )
+        if not sale:
+            raise HTTPException(status_code=404, detail="Sale not found")
+
+        sale_read = to_sale_read(sale)
+        html, qr_code_url = render_pool.render(
+            render_receipt,
+            sale_read,
+            schemas.ReceiptSettingsRead.from_orm(receipt_settings),
+            resolve_logo_src(receipt_settings),
+        )
 
-    return schemas.SaleReceipt(
-        sale=sale_read,
-        receipt_number=sale.receipt_number,
-        issued_at=sale.created_at,
-        html=html,
-        qr_code=qr_code_url,
-        company_name=receipt_settings.company_name,
-        company_logo_url=receipt_settings.company_logo_url,
-        company_tagline=receipt_settings.company_tagline,
-        footer_message=receipt_settings.footer_message,
-    )
+        payload = schemas.SaleReceipt(
+            sale=sale_read,
+            receipt_number=sale.receipt_number,
+            issued_at=sale.created_at,
+            html=html,
+            qr_code=qr_code_url,
+            company_name=receipt_settings.company_name,
+            company_logo_url=receipt_settings.company_logo_url,
+            company_tagline=receipt_settings.company_tagline,
+            footer_message=receipt_settings.footer_message,
+        ).json().encode("utf-8")
+        store_receipt(cache_key, payload)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -2,10 +2,14 @@ import mimetypes
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image
 from sqlalchemy.orm import Session
 
 from .. import auth, config, models, schemas
 from ..database import get_db
+from ..utils.logo_cache import invalidate_logo_cache
+from ..utils.logo_variants import build_logo_variants, logo_variant_files
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -64,6 +68,7 @@ def update_receipt_settings(
     db.add(settings)
     db.commit()
     db.refresh(settings)
+    invalidate_logo_cache()
     return serialize_receipt_settings(settings)
 
 
@@ -94,12 +99,23 @@ async def upload_receipt_logo(
     filename = f"{uuid4().hex}{extension}"
     destination = config.MEDIA_RECEIPT_DIR / filename
     destination.write_bytes(content)
+    # Decoding and resizing a large photo takes around a second; keep it off the event loop.
+    try:
+        await run_in_threadpool(build_logo_variants, destination)
+    except Image.DecompressionBombError:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image is too large. Upload a logo with fewer pixels.",
+        )
 
     settings = get_or_initialize_receipt_settings(db)
     previous_logo = settings.company_logo_url or ""
     if previous_logo.startswith(f"{config.MEDIA_URL}/logos/"):
         relative_old_path = previous_logo.replace(config.MEDIA_URL, "", 1).lstrip("/\\")
         old_path = config.MEDIA_ROOT / relative_old_path
+        for variant in logo_variant_files(old_path):
+            variant.unlink(missing_ok=True)
         if old_path.exists() and old_path.is_file():
             old_path.unlink()
 
@@ -107,4 +123,5 @@ async def upload_receipt_logo(
     db.add(settings)
     db.commit()
     db.refresh(settings)
+    invalidate_logo_cache()
     return serialize_receipt_settings(settings)
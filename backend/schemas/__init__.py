@@ -1,16 +1,29 @@
-from .user import Token, TokenData, UserBase, UserCreate, UserLogin, UserRead
+from .user import RefreshTokenRequest, Token, TokenData, UserBase, UserCreate, UserLogin, UserRead
 from .product import ProductBase, ProductCreate, ProductRead, ProductUpdate
 from .sale import (
     PaymentMethod,
     SaleBase,
+    SaleBatchCreate,
+    SaleBatchEntry,
+    SaleBatchItemResult,
+    SaleBatchResult,
     SaleCreate,
     SaleItemCreate,
     SaleItemRead,
+    SalePage,
     SaleRead,
     SaleReceipt,
 )
 from .expense import ExpenseBase, ExpenseCreate, ExpenseRead, ExpenseUpdate
-from .report import BestSeller, PeriodSummary, ProfitPoint, ReportSummary, UserSales
+from .report import (
+    BestSeller,
+    PeriodSummary,
+    ProfitPoint,
+    ReportExportCreate,
+    ReportExportRead,
+    ReportSummary,
+    UserSales,
+)
 from .settings import ReceiptSettingsRead, ReceiptSettingsUpdate
 from .employee import (
     EmployeeActivity,
@@ -26,6 +39,7 @@ __all__ = [
     "UserLogin",
     "UserRead",
     "Token",
+    "RefreshTokenRequest",
     "TokenData",
     "ProductBase",
     "ProductCreate",
@@ -33,9 +47,14 @@ __all__ = [
     "ProductUpdate",
     "PaymentMethod",
     "SaleBase",
+    "SaleBatchCreate",
+    "SaleBatchEntry",
+    "SaleBatchItemResult",
+    "SaleBatchResult",
     "SaleCreate",
     "SaleItemCreate",
     "SaleItemRead",
+    "SalePage",
     "SaleRead",
     "SaleReceipt",
     "ExpenseBase",
@@ -45,6 +64,8 @@ __all__ = [
     "ProfitPoint",
     "PeriodSummary",
     "ReportSummary",
+    "ReportExportCreate",
+    "ReportExportRead",
     "BestSeller",
     "UserSales",
     "ReceiptSettingsRead",
@@ -1,5 +1,5 @@
-from datetime import date
-from typing import List
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -27,6 +27,9 @@ class QuotationItemRead(BaseModel):
     unit_price: float
     amount: float
 
+    class Config:
+        orm_mode = True
+
 
 class QuotationRead(BaseModel):
     quote_number: str
@@ -40,4 +43,8 @@ class QuotationRead(BaseModel):
     tax_rate: float
     tax_amount: float
     total: float
-    terms: str
+    terms: Optional[str]
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
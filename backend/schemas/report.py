@@ -1,5 +1,5 @@
-from datetime import date
-from typing import List
+from datetime import date, datetime
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -46,3 +46,29 @@ class ReportSummary(BaseModel):
     period_summaries: List[PeriodSummary]
     best_sellers: List[BestSeller]
     sales_by_user: List[UserSales]
+
+
+ReportExportFormat = Literal["pdf", "csv"]
+
+
+class ReportExportCreate(BaseModel):
+    format: ReportExportFormat = "pdf"
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class ReportExportRead(BaseModel):
+    job_id: str
+    format: ReportExportFormat
+    start_date: Optional[date]
+    end_date: Optional[date]
+    status: Literal["pending", "running", "done", "failed"]
+    error: Optional[str]
+    artifact_size: Optional[int]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    download_url: Optional[str] = None
+
+    class Config:
+        orm_mode = True
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SaleItemBase(BaseModel):
@@ -44,6 +44,34 @@ class SaleRead(SaleBase):
         orm_mode = True
 
 
+class SaleBatchEntry(SaleCreate):
+    client_key: str = Field(..., min_length=1, max_length=64)
+
+
+class SaleBatchCreate(BaseModel):
+    sales: List[SaleBatchEntry] = Field(..., max_items=1000)
+
+
+class SaleBatchItemResult(BaseModel):
+    client_key: str
+    status: Literal["created", "duplicate", "failed"]
+    sale: Optional[SaleRead] = None
+    error: Optional[str] = None
+
+
+class SaleBatchResult(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: List[SaleBatchItemResult]
+
+
+class SalePage(BaseModel):
+    items: List[SaleRead]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class SaleReceipt(BaseModel):
     sale: SaleRead
     receipt_number: str
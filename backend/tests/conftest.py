@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+# The app reads its configuration at import time, so point it at a throwaway
+# database and media directory before anything from ``backend`` is imported.
+_tmp_dir = tempfile.mkdtemp(prefix="ancestra-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test.db"
+os.environ["MEDIA_ROOT"] = os.path.join(_tmp_dir, "media")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def login(client):
+    """Return a function that logs in and gives back the auth headers."""
+
+    def _login(username: str, password: str) -> dict:
+        response = client.post("/api/auth/login", data={"username": username, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _login
+
+
+@pytest.fixture(scope="session")
+def owner_headers(login):
+    return login("owner", "owner123")
@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from backend.database import engine
+
+
+@contextmanager
+def count_statements():
+    counter = {"statements": 0}
+
+    def _count(*args, **kwargs):
+        counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def _list_employees(client, headers) -> int:
+    with count_statements() as counter:
+        response = client.get("/api/employees/", headers=headers)
+    assert response.status_code == 200, response.text
+    return counter["statements"]
+
+
+def test_list_employees_query_count_does_not_grow_with_users(client, login, owner_headers):
+    # Warm the token cache so only the listing itself is counted.
+    _list_employees(client, owner_headers)
+    baseline = _list_employees(client, owner_headers)
+
+    product = client.post(
+        "/api/products/",
+        json={"name": "Query Count Rice", "category": "Food", "price": 10.0, "quantity": 100, "reorder_level": 1},
+        headers=owner_headers,
+    )
+    assert product.status_code == 201, product.text
+    for index in range(6):
+        username = f"cashier-count-{index}"
+        registered = client.post(
+            "/api/auth/register",
+            json={"username": username, "full_name": f"Cashier {index}", "role": "cashier", "password": "secret"},
+        )
+        assert registered.status_code == 201, registered.text
+        sale = client.post(
+            "/api/sales/",
+            json={"payment_method": "cash", "items": [{"product_id": product.json()["id"], "quantity": 1}]},
+            headers=login(username, "secret"),
+        )
+        assert sale.status_code == 201, sale.text
+
+    response = client.get("/api/employees/", headers=owner_headers)
+    summaries = {summary["username"]: summary for summary in response.json()}
+    assert summaries["cashier-count-0"]["sales"]["total_count"] == 1
+    assert summaries["cashier-count-0"]["recent_activity"]
+
+    assert _list_employees(client, owner_headers) == baseline
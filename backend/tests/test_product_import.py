@@ -0,0 +1,61 @@
+import csv
+import io
+
+from sqlalchemy import update
+
+from backend import models
+from backend.database import SessionLocal, engine
+from backend.routes.products import generate_product_codes
+from backend.utils.product_import import ProductImporter
+
+
+def _create_product(client, headers, name: str, quantity: int) -> int:
+    response = client.post(
+        "/api/products/",
+        json={"name": name, "category": "Food", "price": 20.0, "quantity": quantity, "reorder_level": 1},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _import_with_sale_in_between(product_id: int, csv_text: str, sold: int) -> None:
+    """Run the importer and commit a sale of ``sold`` units after its preload."""
+
+    class RacingImporter(ProductImporter):
+        def _preload(self, *args) -> None:
+            super()._preload(*args)
+            with engine.begin() as connection:
+                connection.execute(
+                    update(models.Product)
+                    .where(models.Product.id == product_id)
+                    .values(quantity=models.Product.quantity - sold)
+                )
+
+    with SessionLocal() as db:
+        result = RacingImporter(db, generate_product_codes).run(csv.DictReader(io.StringIO(csv_text)))
+        db.commit()
+    assert result["updated"] == 1 and not result["errors"], result
+
+
+def _product(product_id: int) -> models.Product:
+    with SessionLocal() as db:
+        return db.get(models.Product, product_id)
+
+
+def test_import_without_quantity_keeps_concurrent_sales(client, owner_headers):
+    product_id = _create_product(client, owner_headers, "Import Race Beans", 100)
+
+    _import_with_sale_in_between(product_id, f"id,price\n{product_id},25\n", sold=7)
+
+    product = _product(product_id)
+    assert product.price == 25
+    assert product.quantity == 93
+
+
+def test_import_quantity_sets_the_counted_stock(client, owner_headers):
+    product_id = _create_product(client, owner_headers, "Import Stocktake Salt", 100)
+
+    _import_with_sale_in_between(product_id, f"id,quantity\n{product_id},60\n", sold=7)
+
+    assert _product(product_id).quantity == 60
@@ -0,0 +1,133 @@
+import re
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import Select, event, text
+
+from backend.database import SessionLocal, engine
+from backend.routes import reports
+from backend.utils.rollups import cat_day
+
+# A full pass over a table, directly or through an index; ``_1`` suffixes are joinedload aliases.
+FULL_SCAN = re.compile(r"^SCAN (\w+?)(?:_\d+)?(?: |$)")
+
+
+@contextmanager
+def captured_selects():
+    """Collect the SELECTs the app sends, compiled with their values inlined."""
+    statements: list[str] = []
+
+    def _capture(conn, clauseelement, multiparams, params, execution_options):
+        if not isinstance(clauseelement, Select):
+            return
+        if params:
+            # Loader strategies such as selectinload pass their keys separately.
+            clauseelement = clauseelement.params(**params)
+        compiled = clauseelement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        statements.append(str(compiled))
+
+    event.listen(engine, "before_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_execute", _capture)
+
+
+def full_scans(statements: list[str], tables: set[str]) -> list[tuple[str, list[str]]]:
+    """Statements whose plan walks the whole of one of ``tables`` instead of searching an index."""
+    offenders = []
+    with engine.connect() as connection:
+        for sql in statements:
+            plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            if any((match := FULL_SCAN.match(step)) and match.group(1) in tables for step in plan):
+                offenders.append((" ".join(sql.split()), plan))
+    return offenders
+
+
+@pytest.fixture(scope="module")
+def sales_data(client, owner_headers):
+    product = client.post(
+        "/api/products/",
+        json={
+            "name": "Plan Check Flour",
+            "product_code": "PLAN-001",
+            "category": "Food",
+            "price": 10.0,
+            "quantity": 50,
+            "reorder_level": 1,
+        },
+        headers=owner_headers,
+    )
+    assert product.status_code == 201, product.text
+    product_id = product.json()["id"]
+    for _ in range(3):
+        sale = client.post(
+            "/api/sales/",
+            json={"payment_method": "cash", "items": [{"product_id": product_id, "quantity": 1}]},
+            headers=owner_headers,
+        )
+        assert sale.status_code == 201, sale.text
+    return {"product_id": product_id}
+
+
+def _sales_pages(client, headers, data):
+    params = {"limit": 1, "mine": True, "product_id": data["product_id"], "start_date": "2020-01-01T00:00:00"}
+    first = client.get("/api/sales/page", params=params, headers=headers)
+    assert first.status_code == 200, first.text
+    assert first.json()["next_cursor"]
+    second = client.get("/api/sales/page", params={**params, "cursor": first.json()["next_cursor"]}, headers=headers)
+    assert second.status_code == 200, second.text
+
+
+def _report_summary_for_range(client, headers, data):
+    today = cat_day()
+    with SessionLocal() as db:
+        reports.build_report_summary(db, today - timedelta(days=30), today)
+
+
+def _best_sellers(client, headers, data):
+    for window in ("all", "week", "month"):
+        response = client.get("/api/reports/best-sellers", params={"window": window}, headers=headers)
+        assert response.status_code == 200, response.text
+
+
+def _get(url: str, **params):
+    def _request(client, headers, data):
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+
+    return _request
+
+
+def _product_import(client, headers, data):
+    # One row per lookup kind, each for a different product so none is served from memory.
+    csv_text = "id,name,product_code,price\n1,,,121\n,,plan-001,12\n,dish soap,,26\n"
+    response = client.post(
+        "/api/products/import", files={"file": ("prices.csv", csv_text, "text/csv")}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 3, response.json()
+
+
+# Each hot path, and the tables its statements must reach through an index.
+HOT_PATHS = {
+    "sales page filtered by user, product and date": (_sales_pages, {"sales", "sale_items"}),
+    "sales listing by date range": (_get("/api/sales/", start_date="2020-01-01T00:00:00"), {"sales"}),
+    "report summary for a date range": (_report_summary_for_range, {"sales"}),
+    "best sellers": (_best_sellers, {"products"}),
+    "employee stats and activity": (_get("/api/employees/"), {"sales", "activity_logs"}),
+    "expenses by category": (_get("/api/expenses/", category="Utilities"), {"expenses"}),
+    "expenses by date range": (_get("/api/expenses/", start_date="2020-01-01", end_date="2030-12-31"), {"expenses"}),
+    "product import lookups": (_product_import, {"products"}),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_PATHS))
+def test_hot_path_queries_use_indexes(client, owner_headers, sales_data, name):
+    exercise, tables = HOT_PATHS[name]
+    with captured_selects() as statements:
+        exercise(client, owner_headers, sales_data)
+    assert statements, f"{name} sent no SELECT statements"
+    offenders = full_scans(statements, tables)
+    assert not offenders, f"{name} scans a whole table: {offenders}"
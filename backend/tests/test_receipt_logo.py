@@ -0,0 +1,26 @@
+from io import BytesIO
+
+from PIL import Image
+
+from backend import config
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_decompression_bomb_logo_is_rejected(client, owner_headers, monkeypatch):
+    # Pillow refuses images over twice this many pixels.
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+    before = set(config.MEDIA_RECEIPT_DIR.iterdir())
+
+    response = client.post(
+        "/api/settings/receipt/logo",
+        files={"file": ("bomb.png", _png(50, 50), "image/png")},
+        headers=owner_headers,
+    )
+
+    assert response.status_code == 400, response.text
+    assert set(config.MEDIA_RECEIPT_DIR.iterdir()) == before
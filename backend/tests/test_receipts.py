@@ -0,0 +1,33 @@
+def test_missing_sale_is_not_found_even_with_an_etag(client, owner_headers):
+    response = client.get("/api/sales/999999/receipt", headers={**owner_headers, "If-None-Match": "*"})
+    assert response.status_code == 404, response.text
+
+
+def test_renaming_a_product_refreshes_its_receipts(client, owner_headers):
+    product = client.post(
+        "/api/products/",
+        json={"name": "Receipt Rice 2kg", "category": "Food", "price": 30.0, "quantity": 5, "reorder_level": 0},
+        headers=owner_headers,
+    )
+    assert product.status_code == 201, product.text
+    product_id = product.json()["id"]
+    sale = client.post(
+        "/api/sales/",
+        json={"payment_method": "cash", "items": [{"product_id": product_id, "quantity": 1}]},
+        headers=owner_headers,
+    )
+    assert sale.status_code == 201, sale.text
+    url = f"/api/sales/{sale.json()['id']}/receipt"
+
+    first = client.get(url, headers=owner_headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+    assert client.get(url, headers={**owner_headers, "If-None-Match": etag}).status_code == 304
+
+    renamed = client.put(f"/api/products/{product_id}", json={"name": "Receipt Rice 5kg"}, headers=owner_headers)
+    assert renamed.status_code == 200, renamed.text
+
+    second = client.get(url, headers={**owner_headers, "If-None-Match": etag})
+    assert second.status_code == 200, second.text
+    assert second.headers["ETag"] != etag
+    assert second.json()["sale"]["items"][0]["product_name"] == "Receipt Rice 5kg"
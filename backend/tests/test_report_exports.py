@@ -0,0 +1,59 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from backend import config, models
+from backend.database import SessionLocal
+from backend.routes.reports import export_params_hash
+
+STALE = timedelta(seconds=config.REPORT_EXPORT_STALE_SECONDS)
+
+
+def _add_export(status: str, created_ago: timedelta, started_ago=None, finished_ago=None, day=date(2024, 1, 1)):
+    now = datetime.now(timezone.utc)
+    job_id = uuid4().hex
+    job = models.ReportExport(
+        job_id=job_id,
+        format="csv",
+        start_date=day,
+        end_date=day,
+        params_hash=export_params_hash("csv", day, day),
+        status=status,
+        created_at=now - created_ago,
+        started_at=None if started_ago is None else now - started_ago,
+        finished_at=None if finished_ago is None else now - finished_ago,
+    )
+    with SessionLocal() as db:
+        db.add(job)
+        db.commit()
+    return job_id
+
+
+def _status(client, headers, job_id: str) -> str:
+    response = client.get(f"/api/reports/exports/{job_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["status"]
+
+
+def test_export_staleness_counts_from_when_the_worker_claimed_it(client, owner_headers):
+    long_queued = _add_export("running", created_ago=STALE * 2, started_ago=timedelta(seconds=5))
+    assert _status(client, owner_headers, long_queued) == "running"
+
+    abandoned = _add_export("running", created_ago=STALE * 3, started_ago=STALE * 2)
+    assert _status(client, owner_headers, abandoned) == "failed"
+
+    never_claimed = _add_export("pending", created_ago=STALE * 2)
+    assert _status(client, owner_headers, never_claimed) == "failed"
+
+
+def test_recently_finished_export_is_reused(client, owner_headers):
+    day = date(2024, 2, 1)
+    job_id = _add_export(
+        "done", created_ago=STALE * 2, started_ago=STALE * 2, finished_ago=timedelta(seconds=5), day=day
+    )
+    response = client.post(
+        "/api/reports/exports",
+        json={"format": "csv", "start_date": day.isoformat(), "end_date": day.isoformat()},
+        headers=owner_headers,
+    )
+    assert response.status_code == 202, response.text
+    assert response.json()["job_id"] == job_id
@@ -0,0 +1,149 @@
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from backend import models
+from backend.database import SessionLocal, engine
+from backend.routes import sales
+
+STARTING_STOCK = 10
+ATTEMPTS = 40
+THREADS = 8
+PROCESSES = 4
+THREADS_PER_PROCESS = 2
+
+
+def _create_stocked_product(client, headers, name: str, quantity: int) -> int:
+    response = client.post(
+        "/api/products/",
+        json={"name": name, "category": "Food", "price": 15.0, "quantity": quantity, "reorder_level": 0},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _sell_single_units(client, headers, product_id: int, attempts: int, threads: int):
+    """Post ``attempts`` one-unit sales from ``threads`` threads; returns (statuses, started, finished)."""
+
+    def sell_one(_):
+        response = client.post(
+            "/api/sales/",
+            json={"payment_method": "cash", "items": [{"product_id": product_id, "quantity": 1}]},
+            headers=headers,
+        )
+        return response.status_code
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        statuses = list(executor.map(sell_one, range(attempts)))
+    return statuses, started, time.time()
+
+
+def _sell_in_child_process(headers, product_id: int, attempts: int):
+    # Runs in a spawned interpreter that inherits DATABASE_URL, so it shares the test database file.
+    from backend.main import app
+
+    return _sell_single_units(TestClient(app), headers, product_id, attempts, THREADS_PER_PROCESS)
+
+
+def _check_no_oversell(product_id: int, statuses: list[int], starting_stock: int, started: float, finished: float):
+    assert set(statuses) <= {201, 400}, statuses
+    with SessionLocal() as db:
+        remaining = db.get(models.Product, product_id).quantity
+    assert remaining >= 0
+    assert statuses.count(201) == starting_stock
+    assert remaining == 0
+    elapsed = max(finished - started, 1e-9)
+    print(
+        f"{len(statuses)} requests, {statuses.count(201)} sales in {elapsed:.2f}s: "
+        f"{statuses.count(201) / elapsed:.1f} sales/s, {len(statuses) / elapsed:.1f} requests/s"
+    )
+
+
+def test_concurrent_sales_never_oversell(client, owner_headers):
+    product_id = _create_stocked_product(client, owner_headers, "Concurrent Sugar 1kg", STARTING_STOCK)
+
+    statuses, started, finished = _sell_single_units(client, owner_headers, product_id, ATTEMPTS, THREADS)
+
+    _check_no_oversell(product_id, statuses, STARTING_STOCK, started, finished)
+
+
+def test_sales_from_several_processes_never_oversell(client, owner_headers):
+    """Each process stands in for a uvicorn worker with its own engine and connection pool."""
+    stock = ATTEMPTS // 2
+    product_id = _create_stocked_product(client, owner_headers, "Multiprocess Sugar 1kg", stock)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(PROCESSES) as pool:
+        outcomes = pool.starmap(
+            _sell_in_child_process,
+            [(owner_headers, product_id, ATTEMPTS // PROCESSES)] * PROCESSES,
+        )
+
+    statuses = [code for codes, _, _ in outcomes for code in codes]
+    started = min(started for _, started, _ in outcomes)
+    finished = max(finished for _, _, finished in outcomes)
+    _check_no_oversell(product_id, statuses, stock, started, finished)
+
+
+def test_batch_fails_only_the_sales_a_concurrent_sale_starved(client, owner_headers, monkeypatch):
+    def create(name: str, quantity: int) -> int:
+        response = client.post(
+            "/api/products/",
+            json={"name": name, "category": "Food", "price": 5.0, "quantity": quantity, "reorder_level": 0},
+            headers=owner_headers,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    steady_id = create("Batch Steady Tea", 10)
+    contended_id = create("Batch Contended Milk", 5)
+
+    # Another till sells 2 units after the batch read its stock snapshot.
+    reserve = sales.try_reserve_stock
+    raced = []
+
+    def reserve_after_race(db, requested):
+        if not raced:
+            raced.append(True)
+            with engine.begin() as connection:
+                connection.execute(
+                    update(models.Product)
+                    .where(models.Product.id == contended_id)
+                    .values(quantity=models.Product.quantity - 2)
+                )
+        return reserve(db, requested)
+
+    monkeypatch.setattr(sales, "try_reserve_stock", reserve_after_race)
+
+    def entry(key: str, *items: tuple[int, int]) -> dict:
+        return {
+            "client_key": key,
+            "payment_method": "cash",
+            "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in items],
+        }
+
+    response = client.post(
+        "/api/sales/batch",
+        json={
+            "sales": [
+                entry("race-a", (contended_id, 2)),
+                entry("race-b", (steady_id, 1), (contended_id, 2)),
+                entry("race-c", (steady_id, 1)),
+            ]
+        },
+        headers=owner_headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == ["created", "failed", "created"]
+    assert "Batch Contended Milk" in body["results"][1]["error"]
+
+    with SessionLocal() as db:
+        assert db.get(models.Product, contended_id).quantity == 1
+        # The failed sale's unit of tea was put back.
+        assert db.get(models.Product, steady_id).quantity == 9
@@ -0,0 +1,36 @@
+import hashlib
+import hmac
+from pathlib import Path
+from uuid import uuid4
+
+from ..auth import SECRET_KEY
+
+
+def content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def artifact_path(directory: Path, digest: str, suffix: str) -> Path:
+    """Location of the artifact whose content hashes to ``digest``.
+
+    Artifacts live under the public media mount, so the file name is keyed
+    with the server secret and cannot be derived from the digest (which is
+    handed out as an ETag).
+    """
+    name = hmac.new(SECRET_KEY.encode("utf-8"), digest.encode("utf-8"), hashlib.sha256).hexdigest()
+    return directory / f"{name}{suffix}"
+
+
+def store_artifact(directory: Path, content: bytes, suffix: str) -> str:
+    """Write ``content`` once under its content address and return its SHA-256 digest."""
+    digest = content_digest(content)
+    path = artifact_path(directory, digest, suffix)
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.stem}.{uuid4().hex}.tmp")
+        try:
+            temporary_path.write_bytes(content)
+            temporary_path.replace(path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+    return digest
@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Response, status
+from fastapi.responses import FileResponse
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return etag in {candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates}
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Parse a single-range ``Range: bytes=...`` header into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the header is absent or not a single byte range (the
+    whole file is served) and raises ``ValueError`` when the range cannot be
+    satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if not start_text:
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def file_response(
+    path: Path,
+    media_type: str,
+    etag: str,
+    if_none_match: Optional[str] = None,
+    range_header: Optional[str] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """Serve ``path`` with ETag revalidation and single byte-range support."""
+    base_headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "private, no-cache", **(headers or {})}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=base_headers)
+
+    size = path.stat().st_size
+    try:
+        byte_range = parse_byte_range(range_header, size)
+    except ValueError:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**base_headers, "Content-Range": f"bytes */{size}"},
+        )
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=base_headers)
+
+    start, end = byte_range
+    with path.open("rb") as handle:
+        handle.seek(start)
+        content = handle.read(end - start + 1)
+    return Response(
+        content=content,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={**base_headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+    )
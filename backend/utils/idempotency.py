@@ -0,0 +1,91 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from .. import config
+from ..models import IdempotencyRecord
+from .cache import LRUCache
+
+MAX_KEY_LENGTH = 100
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+_recent_responses = LRUCache(maxsize=2048, ttl=config.IDEMPOTENCY_TTL_SECONDS)
+_last_purge = 0.0
+
+
+def validate_key(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+        )
+    return key
+
+
+def _replay(status_code: int, body: str) -> Response:
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def find_response(db: Session, scope: str, user_id: int, key: str) -> Optional[Response]:
+    """Return the stored response for a retried request, or ``None`` on first use."""
+    cache_key = (scope, user_id, key)
+    cached = _recent_responses.get(cache_key)
+    if cached is not None:
+        return _replay(*cached)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS)
+    record = (
+        db.query(IdempotencyRecord.status_code, IdempotencyRecord.response_body)
+        .filter(
+            IdempotencyRecord.scope == scope,
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.created_at >= cutoff,
+        )
+        .first()
+    )
+    if record is None:
+        return None
+    _recent_responses.set(cache_key, (record.status_code, record.response_body))
+    return _replay(record.status_code, record.response_body)
+
+
+def store_response(db: Session, scope: str, user_id: int, key: str, status_code: int, body: str) -> None:
+    """Stage the response in the caller's transaction so it commits with the write it describes."""
+    global _last_purge
+    now = time.monotonic()
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS)
+    if now - _last_purge > PURGE_INTERVAL_SECONDS:
+        _last_purge = now
+        db.query(IdempotencyRecord).filter(IdempotencyRecord.created_at < cutoff).delete(
+            synchronize_session=False
+        )
+    else:
+        # An expired record still holds the unique (scope, user_id, key) slot
+        # until the next purge; clear it so the key can be used again.
+        db.query(IdempotencyRecord).filter(
+            IdempotencyRecord.scope == scope,
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.created_at < cutoff,
+        ).delete(synchronize_session=False)
+    db.add(
+        IdempotencyRecord(
+            scope=scope,
+            user_id=user_id,
+            key=key,
+            status_code=status_code,
+            response_body=body,
+        )
+    )
@@ -0,0 +1,64 @@
+import base64
+import mimetypes
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from .. import config
+from .cache import LRUCache
+from .logo_variants import RASTER_FORMATS, resize_to_height, smallest_receipt_variant
+
+_logo_cache = LRUCache(maxsize=8)
+
+
+def _downscale(content: bytes, max_height: int) -> Optional[tuple[bytes, str]]:
+    """Shrink a raster logo to ``max_height`` pixels, keeping its format."""
+    try:
+        with Image.open(BytesIO(content)) as image:
+            image_format = image.format
+            if image_format not in RASTER_FORMATS or image.height <= max_height:
+                return None
+            resized = resize_to_height(image, max_height)
+            buffer = BytesIO()
+            resized.save(buffer, format=image_format, optimize=True)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        return None
+    if buffer.tell() >= len(content):
+        return None
+    return buffer.getvalue(), RASTER_FORMATS[image_format]
+
+
+def logo_data_uri(logo_path: Path) -> Optional[str]:
+    """Return the logo as a receipt-sized data URI, encoding it at most once per file version.
+
+    Uses the smallest variant generated at upload time; logos uploaded before
+    variants existed are downscaled here instead.
+    """
+    variant_path = smallest_receipt_variant(logo_path)
+    if variant_path:
+        logo_path = variant_path
+    try:
+        stat = logo_path.stat()
+    except OSError:
+        return None
+    key = (str(logo_path), stat.st_mtime_ns, stat.st_size)
+    cached = _logo_cache.get(key)
+    if cached is not None:
+        return cached
+
+    content = logo_path.read_bytes()
+    mime_type = mimetypes.guess_type(logo_path.name)[0] or "image/png"
+    if config.RECEIPT_LOGO_MAX_HEIGHT and not variant_path:
+        downscaled = _downscale(content, config.RECEIPT_LOGO_MAX_HEIGHT)
+        if downscaled:
+            content, mime_type = downscaled
+    encoded = base64.b64encode(content).decode("utf-8")
+    data_uri = f"data:{mime_type};base64,{encoded}"
+    _logo_cache.set(key, data_uri)
+    return data_uri
+
+
+def invalidate_logo_cache() -> None:
+    _logo_cache.clear()
@@ -0,0 +1,81 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from .. import config
+
+RASTER_FORMATS = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+THUMBNAIL_HEIGHT = 64
+
+
+def resize_to_height(image: Image.Image, height: int) -> Image.Image:
+    """Return a copy no taller than ``height``; the copy carries no EXIF/ICC metadata."""
+    if image.height > height:
+        width = max(1, round(image.width * height / image.height))
+        return image.resize((width, height), Image.LANCZOS)
+    return image.copy()
+
+
+def _encode(image: Image.Image, image_format: str, **options) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _png8(image: Image.Image) -> bytes:
+    palette_image = image.convert("RGBA").quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    return _encode(palette_image, "PNG", optimize=True)
+
+
+def variant_path(logo_path: Path, purpose: str, extension: str) -> Path:
+    return logo_path.with_name(f"{logo_path.stem}.{purpose}{extension}")
+
+
+def logo_variant_files(logo_path: Path) -> list[Path]:
+    """Every derived file generated for ``logo_path``."""
+    return sorted(logo_path.parent.glob(f"{logo_path.stem}.*.*"))
+
+
+def build_logo_variants(logo_path: Path) -> dict[str, int]:
+    """Write receipt-sized PNG-8/WebP variants and a WebP thumbnail next to ``logo_path``.
+
+    Returns the size in bytes of each file written, keyed by file name. Vector
+    and unreadable images produce no variants and are served as uploaded.
+    Raises ``Image.DecompressionBombError`` for images over Pillow's pixel limit.
+    """
+    receipt_height = config.RECEIPT_LOGO_MAX_HEIGHT or 240
+    try:
+        with Image.open(logo_path) as image:
+            if image.format not in RASTER_FORMATS:
+                return {}
+            image.load()
+            receipt_image = resize_to_height(image, receipt_height)
+            thumbnail_image = resize_to_height(image, THUMBNAIL_HEIGHT)
+    except (UnidentifiedImageError, OSError, ValueError):
+        return {}
+
+    if receipt_image.mode not in {"RGB", "RGBA"}:
+        receipt_image = receipt_image.convert("RGBA")
+        thumbnail_image = thumbnail_image.convert("RGBA")
+    variants = {
+        variant_path(logo_path, "receipt", ".png"): _png8(receipt_image),
+        variant_path(logo_path, "receipt", ".webp"): _encode(receipt_image, "WEBP", quality=85, method=6),
+        variant_path(logo_path, "thumb", ".webp"): _encode(thumbnail_image, "WEBP", quality=80, method=6),
+    }
+    for path, content in variants.items():
+        path.write_bytes(content)
+    return {path.name: len(content) for path, content in variants.items()}
+
+
+def smallest_receipt_variant(logo_path: Path) -> Optional[Path]:
+    """Smallest pre-built receipt-sized variant of ``logo_path``, if any were generated."""
+    candidates = []
+    for extension in (".png", ".webp"):
+        path = variant_path(logo_path, "receipt", extension)
+        try:
+            candidates.append((path.stat().st_size, path))
+        except OSError:
+            continue
+    return min(candidates)[1] if candidates else None
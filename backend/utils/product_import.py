@@ -0,0 +1,276 @@
+import csv
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from ..models import Product
+
+IMPORT_CHUNK_ROWS = 1000
+PRODUCT_FIELDS = ("id", "name", "product_code", "category", "price", "quantity", "reorder_level")
+
+CodeFactory = Callable[[Session, int, set[str]], list[str]]
+
+
+class ProductImporter:
+    """Apply product CSV rows in chunks with set-based lookups and writes.
+
+    Each chunk loads the products it references with one query per key type
+    (id, lower(product_code), lower(name)), applies the rows in file order
+    against in-memory copies, then writes all changes with one bulk UPDATE
+    and one bulk INSERT. Products created or renamed earlier in the file are
+    found by later rows, and memory use is bounded by the chunk size.
+
+    Only the columns a row actually changes are written back, so sales
+    committed while the import runs are not undone by stale copies. A CSV
+    ``quantity`` is the counted stock level and replaces the current value;
+    it is not added to it.
+    """
+
+    def __init__(self, db: Session, generate_codes: CodeFactory) -> None:
+        self.db = db
+        self.generate_codes = generate_codes
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors: list[str] = []
+        # Working copies of the products the current chunk touches, keyed by id
+        # (or a negative placeholder for rows it inserts).
+        self._products: Dict[int, dict] = {}
+        self._by_code: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        # Existing product id -> the fields rows in this chunk changed.
+        self._dirty: Dict[int, set[str]] = {}
+        self._pending: list[int] = []
+
+    def report(self) -> dict:
+        return {"created": self.created, "updated": self.updated, "skipped": self.skipped, "errors": self.errors}
+
+    def run(self, reader: csv.DictReader) -> dict:
+        chunk: list[tuple[int, Dict[str, str]]] = []
+        for row_number, row in enumerate(reader, start=2):
+            chunk.append(
+                (row_number, {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()})
+            )
+            if len(chunk) >= IMPORT_CHUNK_ROWS:
+                self._apply_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._apply_chunk(chunk)
+        return self.report()
+
+    def _parse_int(self, value: Optional[str], field: str, row_number: int) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        try:
+            return int(float(value))
+        except ValueError:
+            self.errors.append(f"Row {row_number}: Invalid integer for {field!r} -> {value!r}")
+            return None
+
+    def _parse_float(self, value: Optional[str], field: str, row_number: int) -> Optional[float]:
+        if value is None or value == "":
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            self.errors.append(f"Row {row_number}: Invalid number for {field!r} -> {value!r}")
+            return None
+
+    def _remember(self, key: int, product: dict) -> None:
+        self._products[key] = product
+        if product["product_code"]:
+            self._by_code[product["product_code"].lower()] = key
+        self._by_name[product["name"].lower()] = key
+
+    def _preload(self, ids: set[int], codes: set[str], names: set[str]) -> None:
+        """Load referenced products not already held in memory, one query per key type."""
+        columns = [getattr(Product, field) for field in PRODUCT_FIELDS]
+        lookups = (
+            (Product.id, {product_id for product_id in ids if product_id not in self._products}),
+            (func.lower(Product.product_code), {code for code in codes if code not in self._by_code}),
+            (func.lower(Product.name), {name for name in names if name not in self._by_name}),
+        )
+        for column, keys in lookups:
+            if not keys:
+                continue
+            for row in self.db.query(*columns).filter(column.in_(keys)):
+                if row.id not in self._products:
+                    self._remember(row.id, dict(row._mapping))
+
+    def _set(self, key: int, field: str, value) -> None:
+        product = self._products[key]
+        if product[field] == value:
+            return
+        product[field] = value
+        if key > 0:
+            self._dirty.setdefault(key, set()).add(field)
+
+    def _find(self, product_id: Optional[int], product_code: Optional[str], name: Optional[str]) -> Optional[int]:
+        if product_id:
+            return product_id if product_id in self._products else None
+        if product_code:
+            return self._by_code.get(product_code.lower())
+        if name:
+            return self._by_name.get(name.lower())
+        return None
+
+    def _conflict(self, key: Optional[int], name: Optional[str], product_code: Optional[str]) -> Optional[str]:
+        if name and self._by_name.get(name.lower(), key) != key:
+            return f"a product named {name!r} already exists"
+        if product_code and self._by_code.get(product_code.lower(), key) != key:
+            return f"product code {product_code!r} is already in use"
+        return None
+
+    def _apply_chunk(self, chunk: list[tuple[int, Dict[str, str]]]) -> None:
+        ids: set[int] = set()
+        codes: set[str] = set()
+        names: set[str] = set()
+        for _, fields in chunk:
+            raw_id = fields.get("id") or fields.get("product_id")
+            try:
+                if raw_id:
+                    ids.add(int(float(raw_id)))
+            except ValueError:
+                pass
+            code = fields.get("product_code") or fields.get("code")
+            if code:
+                codes.add(code.lower())
+            name = fields.get("name") or fields.get("product_name")
+            if name:
+                names.add(name.lower())
+        self._preload(ids, codes, names)
+
+        for row_number, fields in chunk:
+            self._apply_row(row_number, fields)
+        self._flush()
+
+    def _apply_row(self, row_number: int, fields: Dict[str, str]) -> None:
+        product_id = self._parse_int(fields.get("id") or fields.get("product_id"), "id", row_number)
+        name = fields.get("name") or fields.get("product_name")
+        product_code = fields.get("product_code") or fields.get("code")
+        category = fields.get("category")
+        price = self._parse_float(fields.get("price"), "price", row_number)
+        quantity = self._parse_int(fields.get("quantity"), "quantity", row_number)
+        reorder_level = self._parse_int(fields.get("reorder_level"), "reorder_level", row_number)
+
+        key = self._find(product_id, product_code, name)
+        if product_id and key is None:
+            self.errors.append(f"Row {row_number}: Product with id={product_id} not found; skipping.")
+            self.skipped += 1
+            return
+
+        if key is not None:
+            conflict = self._conflict(key, name, product_code)
+            if conflict:
+                self.errors.append(f"Row {row_number}: {conflict}; skipping.")
+                self.skipped += 1
+                return
+            product = self._products[key]
+            if name and name != product["name"]:
+                self._by_name.pop(product["name"].lower(), None)
+                self._set(key, "name", name)
+                self._by_name[name.lower()] = key
+            if product_code and product_code != product["product_code"]:
+                if product["product_code"]:
+                    self._by_code.pop(product["product_code"].lower(), None)
+                self._set(key, "product_code", product_code)
+                self._by_code[product_code.lower()] = key
+            if category:
+                self._set(key, "category", category)
+            if price is not None:
+                if price < 0:
+                    self.errors.append(f"Row {row_number}: price must be positive.")
+                else:
+                    self._set(key, "price", price)
+            if quantity is not None:
+                if quantity < 0:
+                    self.errors.append(f"Row {row_number}: quantity must be positive.")
+                else:
+                    self._set(key, "quantity", quantity)
+            if reorder_level is not None:
+                if reorder_level < 0:
+                    self.errors.append(f"Row {row_number}: reorder_level must be positive.")
+                else:
+                    self._set(key, "reorder_level", reorder_level)
+            self.updated += 1
+            return
+
+        # Creating a new product requires mandatory fields
+        if not name:
+            self.errors.append(f"Row {row_number}: name is required to create a new product.")
+            self.skipped += 1
+            return
+        if category is None or category == "":
+            self.errors.append(f"Row {row_number}: category is required to create a new product.")
+            self.skipped += 1
+            return
+        if price is None:
+            self.errors.append(f"Row {row_number}: price is required to create a new product.")
+            self.skipped += 1
+            return
+        if price < 0:
+            self.errors.append(f"Row {row_number}: price must be positive.")
+            self.skipped += 1
+            return
+        if quantity is None:
+            self.errors.append(f"Row {row_number}: quantity is required to create a new product.")
+            self.skipped += 1
+            return
+        if quantity < 0:
+            self.errors.append(f"Row {row_number}: quantity must be positive.")
+            self.skipped += 1
+            return
+        conflict = self._conflict(None, name, product_code)
+        if conflict:
+            self.errors.append(f"Row {row_number}: {conflict}; skipping.")
+            self.skipped += 1
+            return
+
+        placeholder = -(len(self._pending) + 1)
+        self._pending.append(placeholder)
+        self._remember(
+            placeholder,
+            {
+                "id": None,
+                "name": name,
+                "product_code": product_code or None,
+                "category": category,
+                "price": price,
+                "quantity": quantity,
+                "reorder_level": reorder_level or 0,
+            },
+        )
+        self.created += 1
+
+    def _flush(self) -> None:
+        """Write the chunk's changes; later chunks read the written rows back from the database."""
+        # One executemany per distinct set of changed columns; a price-only
+        # file never touches quantity.
+        batches: Dict[tuple[str, ...], list[dict]] = {}
+        for key in sorted(self._dirty):
+            fields = tuple(field for field in PRODUCT_FIELDS if field in self._dirty[key])
+            values = {field: self._products[key][field] for field in fields}
+            values["id"] = key
+            batches.setdefault(fields, []).append(values)
+        for rows in batches.values():
+            self.db.execute(update(Product), rows)
+
+        if self._pending:
+            new_products = [self._products[key] for key in self._pending]
+            # Auto-generate product codes for rows that did not provide one
+            missing_codes = [product for product in new_products if not product["product_code"]]
+            if missing_codes:
+                codes = self.generate_codes(self.db, len(missing_codes), set(self._by_code))
+                for product, code in zip(missing_codes, codes):
+                    product["product_code"] = code
+            self.db.execute(
+                insert(Product),
+                [{field: product[field] for field in PRODUCT_FIELDS if field != "id"} for product in new_products],
+            )
+
+        self._products.clear()
+        self._by_code.clear()
+        self._by_name.clear()
+        self._dirty.clear()
+        self._pending = []
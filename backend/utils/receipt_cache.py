@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+from typing import Optional, Sequence
+from uuid import uuid4
+
+from .. import config
+from ..auth import SECRET_KEY
+from ..models import ReceiptSettings
+from .cache import LRUCache
+
+_memory_cache = LRUCache(maxsize=config.RECEIPT_CACHE_SIZE)
+
+
+def receipt_settings_version(settings: ReceiptSettings) -> str:
+    """Fingerprint of every receipt setting that ends up in the rendered markup."""
+    fields = (
+        settings.company_name,
+        settings.company_address,
+        settings.company_logo_url,
+        settings.company_tagline,
+        settings.footer_message,
+        settings.updated_at.isoformat() if settings.updated_at else "",
+    )
+    return hashlib.sha256("\x1f".join(str(field or "") for field in fields).encode("utf-8")).hexdigest()[:16]
+
+
+def receipt_cache_key(sale_id: int, settings: ReceiptSettings, product_names: Sequence[str]) -> str:
+    """Sales are immutable, so a receipt only changes with the receipt settings or its products' names."""
+    names = hashlib.sha256("\x1f".join(product_names).encode("utf-8")).hexdigest()[:16]
+    return f"{sale_id}-{receipt_settings_version(settings)}-{names}"
+
+
+def _disk_path(key: str):
+    # The cache lives under the public media mount, so file names are keyed
+    # with the server secret rather than the guessable sale id.
+    digest = hmac.new(SECRET_KEY.encode("utf-8"), key.encode("utf-8"), hashlib.sha256).hexdigest()
+    return config.MEDIA_RECEIPT_CACHE_DIR / f"{digest}.json"
+
+
+def get_cached_receipt(key: str) -> Optional[bytes]:
+    payload = _memory_cache.get(key)
+    if payload is not None or not config.RECEIPT_DISK_CACHE:
+        return payload
+    path = _disk_path(key)
+    try:
+        payload = path.read_bytes()
+    except OSError:
+        return None
+    _memory_cache.set(key, payload)
+    return payload
+
+
+def store_receipt(key: str, payload: bytes) -> None:
+    _memory_cache.set(key, payload)
+    if not config.RECEIPT_DISK_CACHE:
+        return
+    path = _disk_path(key)
+    temporary_path = path.with_name(f"{path.stem}.{uuid4().hex}.tmp")
+    try:
+        temporary_path.write_bytes(payload)
+        temporary_path.replace(path)
+    except OSError:
+        temporary_path.unlink(missing_ok=True)
+
+
+def clear_receipt_cache() -> None:
+    _memory_cache.clear()
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from .. import config
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Running plus queued jobs; a slot is only released once its job actually finishes.
+_slots = threading.BoundedSemaphore(max(1, config.RENDER_WORKERS + config.RENDER_QUEUE_SIZE))
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=config.RENDER_WORKERS)
+        return _executor
+
+
+def render(fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+    """Run the pure, module-level ``fn(*args)`` in the rendering pool and return its result.
+
+    Arguments and results must be picklable plain data (schemas, strings,
+    bytes). Raises 429 when every worker is busy and the queue is full (after
+    waiting up to ``RENDER_TIMEOUT_SECONDS`` for a slot when ``wait`` is set,
+    as background jobs do), and 504 when the job does not finish within
+    ``RENDER_TIMEOUT_SECONDS``.
+    """
+    acquired = (
+        _slots.acquire(timeout=config.RENDER_TIMEOUT_SECONDS) if wait else _slots.acquire(blocking=False)
+    )
+    if not acquired:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rendering is busy, please retry shortly",
+            headers={"Retry-After": "2"},
+        )
+    if config.RENDER_WORKERS == 0:
+        try:
+            return fn(*args)
+        finally:
+            _slots.release()
+
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=config.RENDER_TIMEOUT_SECONDS)
+    except TimeoutError:
+        future.cancel()
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Rendering timed out",
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool for the next job.
+        shutdown()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Rendering worker crashed, please retry",
+        )
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import DailyRollup, Expense, ProductDailySales, ProductSalesTotal, Sale, SaleItem
+from .timezone import now_cat, utc_to_cat
+
+PAYMENT_METHOD_COLUMNS = {
+    "cash": "cash_total",
+    "bank_transfer": "bank_transfer_total",
+    "airtel_money": "airtel_money_total",
+    "mtn_money": "mtn_money_total",
+}
+
+
+def cat_day(moment: Optional[datetime] = None) -> date:
+    """Return the CAT calendar day for ``moment`` (defaults to now)."""
+    if moment is None:
+        return now_cat().date()
+    return utc_to_cat(moment).date()
+
+
+def upsert_increment(db: Session, model, keys: dict, increments: dict) -> None:
+    """Add ``increments`` to the row identified by ``keys``, creating it if missing.
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite and Postgres so that
+    concurrent writers never race on the first row of a bucket.
+    """
+    increments = {column: value for column, value in increments.items() if value}
+    if not increments:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in {"sqlite", "postgresql"}:
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(model).values(**keys, **increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: getattr(model, column) + stmt.excluded[column] for column in increments},
+        )
+        db.execute(stmt)
+        return
+
+    conditions = [getattr(model, column) == value for column, value in keys.items()]
+    result = db.execute(
+        update(model)
+        .where(*conditions)
+        .values({column: getattr(model, column) + value for column, value in increments.items()})
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(model).values(**keys, **increments))
+
+
+def record_sale(db: Session, day: date, payment_method: str, amount: float, orders: int = 1) -> None:
+    """Add a sale (or a batch of sales) to the daily rollup in the caller's transaction."""
+    increments = {"sales_total": amount, "order_count": orders}
+    method_column = PAYMENT_METHOD_COLUMNS.get(payment_method)
+    if method_column:
+        increments[method_column] = amount
+    upsert_increment(db, DailyRollup, {"day": day}, increments)
+
+
+def record_expense(db: Session, day: date, amount: float) -> None:
+    """Add ``amount`` (negative to remove) to the expense total for ``day``."""
+    upsert_increment(db, DailyRollup, {"day": day}, {"expense_total": amount})
+
+
+def record_product_sales(db: Session, day: date, lines: Iterable[tuple[int, int, float]]) -> None:
+    """Add ``(product_id, quantity, revenue)`` sale lines to the per-product rollups."""
+    per_product: dict[int, list] = defaultdict(lambda: [0, 0.0])
+    for product_id, quantity, revenue in lines:
+        per_product[product_id][0] += quantity
+        per_product[product_id][1] += revenue
+
+    for product_id in sorted(per_product):
+        quantity, revenue = per_product[product_id]
+        increments = {"quantity": quantity, "revenue": revenue}
+        upsert_increment(db, ProductDailySales, {"product_id": product_id, "day": day}, increments)
+        upsert_increment(
+            db,
+            ProductSalesTotal,
+            {"product_id": product_id},
+            {"total_quantity": quantity, "total_revenue": revenue},
+        )
+
+
+def rebuild_daily_rollups(db: Session) -> int:
+    """Recompute the daily rollup from the full sales and expense history."""
+    buckets: dict[date, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    sales = db.query(Sale.created_at, Sale.total_amount, Sale.payment_method).yield_per(5000)
+    for created_at, total_amount, payment_method in sales:
+        bucket = buckets[cat_day(created_at) if created_at else cat_day()]
+        bucket["sales_total"] += total_amount or 0.0
+        bucket["order_count"] += 1
+        method_column = PAYMENT_METHOD_COLUMNS.get(payment_method)
+        if method_column:
+            bucket[method_column] += total_amount or 0.0
+
+    expense_rows = (
+        db.query(Expense.expense_date, func.coalesce(func.sum(Expense.amount), 0.0))
+        .group_by(Expense.expense_date)
+        .all()
+    )
+    for expense_date, amount in expense_rows:
+        buckets[expense_date]["expense_total"] += float(amount or 0.0)
+
+    db.execute(delete(DailyRollup))
+    if buckets:
+        db.execute(
+            insert(DailyRollup),
+            [
+                {
+                    "day": day,
+                    "sales_total": values["sales_total"],
+                    "order_count": int(values["order_count"]),
+                    "expense_total": values["expense_total"],
+                    **{column: values[column] for column in PAYMENT_METHOD_COLUMNS.values()},
+                }
+                for day, values in buckets.items()
+            ],
+        )
+    return len(buckets)
+
+
+def rebuild_product_rollups(db: Session) -> int:
+    """Recompute the per-product totals and daily buckets from every sale item."""
+    buckets: dict[tuple[int, date], list] = defaultdict(lambda: [0, 0.0])
+
+    lines = (
+        db.query(SaleItem.product_id, SaleItem.quantity, SaleItem.subtotal, Sale.created_at)
+        .join(Sale, Sale.id == SaleItem.sale_id)
+        .filter(SaleItem.product_id.isnot(None))
+        .yield_per(5000)
+    )
+    for product_id, quantity, subtotal, created_at in lines:
+        bucket = buckets[(product_id, cat_day(created_at) if created_at else cat_day())]
+        bucket[0] += quantity or 0
+        bucket[1] += subtotal or 0.0
+
+    totals: dict[int, list] = defaultdict(lambda: [0, 0.0])
+    for (product_id, _), (quantity, revenue) in buckets.items():
+        totals[product_id][0] += quantity
+        totals[product_id][1] += revenue
+
+    db.execute(delete(ProductDailySales))
+    db.execute(delete(ProductSalesTotal))
+    if buckets:
+        db.execute(
+            insert(ProductDailySales),
+            [
+                {"product_id": product_id, "day": day, "quantity": quantity, "revenue": revenue}
+                for (product_id, day), (quantity, revenue) in buckets.items()
+            ],
+        )
+        db.execute(
+            insert(ProductSalesTotal),
+            [
+                {"product_id": product_id, "total_quantity": quantity, "total_revenue": revenue}
+                for product_id, (quantity, revenue) in totals.items()
+            ],
+        )
+    return len(totals)
@@ -0,0 +1,130 @@
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..database import engine
+from ..models import SequenceCounter
+
+SeedFn = Callable[[Connection, str], int]
+
+
+def _advance(conn: Connection, name: str, size: int, seed: Optional[SeedFn]) -> Optional[int]:
+    counter = SequenceCounter.__table__
+    stmt = update(counter).where(counter.c.name == name).values(value=counter.c.value + size)
+    if conn.dialect.update_returning:
+        row = conn.execute(stmt.returning(counter.c.value)).first()
+    else:
+        result = conn.execute(stmt)
+        row = None
+        if result.rowcount:
+            row = conn.execute(select(counter.c.value).where(counter.c.name == name)).first()
+    if row is not None:
+        return row[0]
+
+    start = seed(conn, name) if seed else 0
+    dialect = conn.dialect.name
+    if dialect in {"sqlite", "postgresql"}:
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        upsert = insert_fn(counter).values(name=name, value=start + size)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[counter.c.name], set_={"value": counter.c.value + size}
+        )
+        return conn.execute(upsert.returning(counter.c.value)).scalar_one()
+    try:
+        with conn.begin_nested():
+            conn.execute(insert(counter).values(name=name, value=start + size))
+        return start + size
+    except IntegrityError:
+        # Another worker created the row first; take the UPDATE path again.
+        return None
+
+
+def reserve_block(
+    name: str,
+    size: int,
+    seed: Optional[SeedFn] = None,
+    connection: Optional[Connection] = None,
+) -> int:
+    """Advance sequence ``name`` by ``size`` and return the last value of the reserved block.
+
+    Runs in its own short transaction so the reservation never waits on, or
+    rolls back with, the caller's unit of work. Pass ``connection`` to reserve
+    inside the caller's transaction instead, e.g. when it already holds
+    SQLite's single write lock. ``seed`` supplies the starting value the
+    first time a sequence is used.
+    """
+    for _ in range(3):
+        if connection is not None:
+            last = _advance(connection, name, size, seed)
+        else:
+            with engine.begin() as conn:
+                last = _advance(conn, name, size, seed)
+        if last is not None:
+            return last
+    raise RuntimeError(f"Could not reserve values from sequence {name!r}")
+
+
+def caller_connection_if_locked(db: Session) -> Optional[Connection]:
+    """The session's connection when it already holds SQLite's write lock, else ``None``.
+
+    SQLite allows a single writer, so a separate reservation transaction would
+    wait on the caller until it times out; reserving through the caller's own
+    connection avoids that.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return None
+    connection = db.connection()
+    return connection if connection.connection.dbapi_connection.in_transaction else None
+
+
+class BlockAllocator:
+    """Hands out sequence values from blocks reserved ``block_size`` at a time.
+
+    Only the most recently used sequence name keeps a block in memory, which
+    suits per-day sequences such as receipt numbers. Values reserved but never
+    handed out (for example on restart) are skipped, so sequences may have gaps
+    and numbers from different workers interleave.
+    """
+
+    def __init__(self, block_size: int, seed: Optional[SeedFn] = None) -> None:
+        self.block_size = block_size
+        self.seed = seed
+        self._name: Optional[str] = None
+        self._next, self._end = 1, 0
+        self._lock = threading.Lock()
+
+    def take(self, name: str, count: int = 1, connection: Optional[Connection] = None) -> list[int]:
+        """Return ``count`` new values of sequence ``name``.
+
+        With ``connection`` exactly ``count`` values are reserved in the
+        caller's transaction and nothing is kept in memory, so a rollback
+        cannot leave this worker holding values the counter will hand out again.
+        """
+        if connection is not None:
+            last = reserve_block(name, count, self.seed, connection)
+            return list(range(last - count + 1, last + 1))
+        with self._lock:
+            if name != self._name:
+                self._name, self._next, self._end = name, 1, 0
+            values: list[int] = []
+            available = self._end - self._next + 1
+            if available > 0:
+                taken = min(available, count)
+                values.extend(range(self._next, self._next + taken))
+                self._next += taken
+            missing = count - len(values)
+            if missing:
+                size = max(self.block_size, missing)
+                last = reserve_block(name, size, self.seed)
+                first = last - size + 1
+                values.extend(range(first, first + missing))
+                self._next, self._end = first + missing, last
+            return values
+
+    def next(self, name: str) -> int:
+        return self.take(name)[0]
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, time, timezone, timedelta
 
 # Central Africa Time (CAT) - UTC+2
 CAT_TIMEZONE = timezone(timedelta(hours=2))
@@ -20,4 +20,8 @@ def format_cat_time(dt, format_str="%d %b %Y at %H:%M CAT"):
         # Assume UTC if no timezone info
         dt = dt.replace(tzinfo=timezone.utc)
     cat_time = dt.astimezone(CAT_TIMEZONE)
-    return cat_time.strftime(format_str)
\ No newline at end of file
+    return cat_time.strftime(format_str)
+
+def cat_day_start_utc(day: date) -> datetime:
+    """UTC instant at which the CAT calendar day ``day`` begins"""
+    return datetime.combine(day, time.min, tzinfo=CAT_TIMEZONE).astimezone(timezone.utc)
@@ -1,6 +1,6 @@
 import { createContext, useContext, useEffect, useMemo, useState, useCallback, useRef } from 'react'
 
-import api from '../utils/api.js'
+import api, { REFRESH_TOKEN_KEY, SESSION_EXPIRED_EVENT, TOKEN_KEY } from '../utils/api.js'
 
 const AuthContext = createContext(undefined)
 
@@ -12,7 +12,7 @@ export const AuthProvider = ({ children }) => {
     const stored = localStorage.getItem('ancestra_user')
     return stored ? JSON.parse(stored) : null
   })
-  const [token, setToken] = useState(() => localStorage.getItem('ancestra_token'))
+  const [token, setToken] = useState(() => localStorage.getItem(TOKEN_KEY))
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
   const inactivityTimerRef = useRef(null)
@@ -65,12 +65,23 @@ export const AuthProvider = ({ children }) => {
 
   useEffect(() => {
     if (token) {
-      localStorage.setItem('ancestra_token', token)
+      localStorage.setItem(TOKEN_KEY, token)
     } else {
-      localStorage.removeItem('ancestra_token')
+      localStorage.removeItem(TOKEN_KEY)
+      localStorage.removeItem(REFRESH_TOKEN_KEY)
     }
   }, [token])
 
+  // The API client signals when a session can no longer be refreshed
+  useEffect(() => {
+    const handleExpired = () => {
+      setToken(null)
+      setUser(null)
+    }
+    window.addEventListener(SESSION_EXPIRED_EVENT, handleExpired)
+    return () => window.removeEventListener(SESSION_EXPIRED_EVENT, handleExpired)
+  }, [])
+
   useEffect(() => {
     if (user) {
       localStorage.setItem('ancestra_user', JSON.stringify(user))
@@ -87,6 +98,7 @@ export const AuthProvider = ({ children }) => {
       const { data } = await api.post('/auth/login', params, {
         headers: { 'Content-Type': 'application/x-www-form-urlencoded' }
       })
+      localStorage.setItem(REFRESH_TOKEN_KEY, data.refresh_token)
       setToken(data.access_token)
       const meResponse = await api.get('/auth/me', {
         headers: { Authorization: `Bearer ${data.access_token}` }
@@ -116,6 +128,10 @@ export const AuthProvider = ({ children }) => {
   }
 
   const logout = () => {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY)
+    if (refreshToken) {
+      api.post('/auth/logout', { refresh_token: refreshToken }).catch(() => {})
+    }
     setToken(null)
     setUser(null)
   }
@@ -3,16 +3,62 @@ import axios from 'axios'
 const baseURL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 const apiURL = baseURL.endsWith('/') ? baseURL + 'api' : baseURL + '/api'
 
+export const TOKEN_KEY = 'ancestra_token'
+export const REFRESH_TOKEN_KEY = 'ancestra_refresh_token'
+export const SESSION_EXPIRED_EVENT = 'ancestra:session-expired'
+
 const api = axios.create({
   baseURL: apiURL
 })
 
 api.interceptors.request.use((config) => {
-  const token = localStorage.getItem('ancestra_token')
+  const token = localStorage.getItem(TOKEN_KEY)
   if (token) {
     config.headers.Authorization = `Bearer ${token}`
   }
   return config
 })
 
-export default api
\ No newline at end of file
+// Concurrent 401s share one refresh request, since each refresh token can only be used once.
+let refreshPromise = null
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY)
+    refreshPromise = (refreshToken
+      ? axios.post(`${apiURL}/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('No refresh token'))
+    )
+      .then(({ data }) => {
+        localStorage.setItem(TOKEN_KEY, data.access_token)
+        localStorage.setItem(REFRESH_TOKEN_KEY, data.refresh_token)
+        return data.access_token
+      })
+      .finally(() => {
+        refreshPromise = null
+      })
+  }
+  return refreshPromise
+}
+
+api.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const original = error.config
+    const isAuthCall = original?.url?.startsWith('/auth/login') || original?.url?.startsWith('/auth/refresh')
+    if (error.response?.status !== 401 || !original || original._retried || isAuthCall) {
+      return Promise.reject(error)
+    }
+    original._retried = true
+    try {
+      const token = await refreshAccessToken()
+      original.headers.Authorization = `Bearer ${token}`
+      return api(original)
+    } catch (refreshError) {
+      window.dispatchEvent(new Event(SESSION_EXPIRED_EVENT))
+      return Promise.reject(error)
+    }
+  }
+)
+
+export default api